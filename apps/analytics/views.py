@@ -1,6 +1,6 @@
 from datetime import timedelta
 
-from django.db.models import Count, F, Q
+from django.db.models import Avg, Count, F, Q
 from django.db.models.functions import TruncWeek
 from django.utils import timezone
 
@@ -22,9 +22,14 @@ class DashboardView(APIView):
         applications = Application.objects.filter(user=user)
         interviews = Interview.objects.filter(application__user=user)
 
-        # Basic counts
-        total_apps = applications.count()
-        active_apps = applications.exclude(status__in=["rejected", "withdrawn", "ghosted", "accepted"]).count()
+        # Basic counts, response stats and average response time in a single query
+        stats = applications.aggregate(
+            total_apps=Count("id"),
+            active_apps=Count("id", filter=~Q(status__in=["rejected", "withdrawn", "ghosted", "accepted"])),
+            apps_with_response=Count("id", filter=Q(response_date__isnull=False)),
+            avg_response_time=Avg(F("response_date") - F("applied_date")),
+        )
+        total_apps = stats["total_apps"]
 
         # Status breakdown
         status_counts = dict(applications.values("status").annotate(count=Count("id")).values_list("status", "count"))
@@ -33,23 +38,17 @@ class DashboardView(APIView):
         upcoming_interviews = interviews.filter(scheduled_at__gte=timezone.now(), status="scheduled").count()
 
         # Response rate
-        apps_with_response = applications.filter(response_date__isnull=False).count()
-        response_rate = (apps_with_response / total_apps * 100) if total_apps > 0 else 0
+        response_rate = (stats["apps_with_response"] / total_apps * 100) if total_apps > 0 else 0
 
         # Average response time (days)
-        apps_with_dates = applications.filter(applied_date__isnull=False, response_date__isnull=False).annotate(
-            response_days=F("response_date") - F("applied_date")
-        )
         avg_response_days = None
-        if apps_with_dates.exists():
-            # Calculate average manually since SQLite doesn't support date subtraction well
-            total_days = sum((app.response_date - app.applied_date).days for app in apps_with_dates)
-            avg_response_days = round(total_days / apps_with_dates.count(), 1)
+        if stats["avg_response_time"] is not None:
+            avg_response_days = round(stats["avg_response_time"].total_seconds() / 86400, 1)
 
         return Response(
             {
                 "total_applications": total_apps,
-                "active_applications": active_apps,
+                "active_applications": stats["active_apps"],
                 "offers_received": status_counts.get("offer", 0) + status_counts.get("accepted", 0),
                 "interviews_scheduled": upcoming_interviews,
                 "response_rate": round(response_rate, 1),
@@ -38,4 +38,7 @@ class Company(models.Model):
 
     @property
     def application_count(self):
+        # Use the count annotated by CompanyViewSet when present
+        if hasattr(self, "num_applications"):
+            return self.num_applications
         return self.applications.count()
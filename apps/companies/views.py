@@ -1,3 +1,5 @@
+from django.db.models import Count
+
 from rest_framework import filters, viewsets
 from rest_framework.permissions import IsAuthenticated
 
@@ -22,7 +24,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Return companies for the current user only."""
-        return Company.objects.filter(user=self.request.user)
+        return Company.objects.filter(user=self.request.user).annotate(num_applications=Count("applications"))
 
     def get_serializer_class(self):
         """Use lightweight serializer for list action."""
@@ -6,7 +6,7 @@ import csv
 import io
 from datetime import datetime
 
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 
 
 class ExportService:
@@ -170,7 +170,7 @@ class ExportService:
     def export_full_report_csv(user):
         """
         Export complete job search data for a user.
-        Returns a ZIP file with all CSVs.
+        Returns a ZIP file with all CSVs, streamed from the in-memory buffer.
         """
         import zipfile
 
@@ -203,12 +203,11 @@ class ExportService:
             summary = ExportService._generate_summary(user, apps, companies, interviews)
             zip_file.writestr("summary.txt", summary)
 
+        # Stream the buffer in chunks rather than copying it into the response body
         zip_buffer.seek(0)
-        response = HttpResponse(zip_buffer.read(), content_type="application/zip")
         filename = f"job_search_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
-        return response
+        return FileResponse(zip_buffer, as_attachment=True, filename=filename, content_type="application/zip")
 
     @staticmethod
     def _generate_applications_csv_content(applications):
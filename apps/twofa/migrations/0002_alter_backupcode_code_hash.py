@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("twofa", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="backupcode",
+            name="code_hash",
+            field=models.CharField(db_index=True, max_length=128),
+        ),
+    ]
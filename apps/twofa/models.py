@@ -2,11 +2,39 @@
 Two-Factor Authentication Models.
 """
 
+import hashlib
+import hmac
 import secrets
 import uuid
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+
+def _backup_code_peppers():
+    """
+    Return the keys stored backup codes may be hashed with, current key first.
+
+    Without TWOFA_CODE_PEPPER the pepper is SECRET_KEY, so keys retired to
+    SECRET_KEY_FALLBACKS by a rotation keep verifying codes issued before it.
+    """
+    pepper = getattr(settings, "TWOFA_CODE_PEPPER", "")
+    if pepper:
+        return [pepper]
+    return [settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS]
+
+
+def _hash_backup_code(code, pepper=None):
+    """
+    Return the keyed SHA-256 digest stored for a formatted backup code.
+
+    Codes carry 32 random bits, so a slow password hash buys nothing; the
+    server-side pepper (TWOFA_CODE_PEPPER, else SECRET_KEY) keeps a leaked
+    table from being brute-forced offline.
+    """
+    pepper = pepper or _backup_code_peppers()[0]
+    return hmac.new(pepper.encode(), code.encode(), hashlib.sha256).hexdigest()
 
 
 class TwoFactorDevice(models.Model):
@@ -46,7 +74,7 @@ class BackupCode(models.Model):
     device = models.ForeignKey(TwoFactorDevice, on_delete=models.CASCADE, related_name="backup_codes")
 
     # Hashed backup code
-    code_hash = models.CharField(max_length=128)
+    code_hash = models.CharField(max_length=128, db_index=True)
 
     # Usage tracking
     is_used = models.BooleanField(default=False)
@@ -74,22 +102,15 @@ class BackupCode(models.Model):
         Returns:
             List of plain text codes (only returned once!)
         """
-        import hashlib
-
         # Delete existing unused codes
         cls.objects.filter(device=device, is_used=False).delete()
 
-        codes = []
-        for _ in range(count):
-            # Generate 8-character alphanumeric code
-            code = secrets.token_hex(4).upper()
-            formatted_code = f"{code[:4]}-{code[4:]}"
-
-            # Hash for storage
-            code_hash = hashlib.sha256(formatted_code.encode()).hexdigest()
+        # Draw every code's randomness at once: 8 hex characters (4 bytes) per code
+        raw = secrets.token_hex(4 * count).upper()
+        codes = [f"{raw[i:i + 4]}-{raw[i + 4:i + 8]}" for i in range(0, 8 * count, 8)]
 
-            cls.objects.create(device=device, code_hash=code_hash)
-            codes.append(formatted_code)
+        # Store only the hashes, in a single INSERT
+        cls.objects.bulk_create([cls(device=device, code_hash=_hash_backup_code(code)) for code in codes])
 
         return codes
 
@@ -105,20 +126,16 @@ class BackupCode(models.Model):
         Returns:
             True if valid, False otherwise
         """
-        import hashlib
-
-        from django.utils import timezone
-
         # Normalize code
         code = code.upper().replace(" ", "").replace("-", "")
         formatted_code = f"{code[:4]}-{code[4:]}" if len(code) == 8 else code
-        code_hash = hashlib.sha256(formatted_code.encode()).hexdigest()
-
-        try:
-            backup_code = cls.objects.get(device=device, code_hash=code_hash, is_used=False)
-            backup_code.is_used = True
-            backup_code.used_at = timezone.now()
-            backup_code.save()
-            return True
-        except cls.DoesNotExist:
-            return False
+
+        # Codes issued before peppering were stored as plain SHA-256
+        code_hashes = [_hash_backup_code(formatted_code, pepper) for pepper in _backup_code_peppers()]
+        code_hashes.append(hashlib.sha256(formatted_code.encode()).hexdigest())
+
+        # Match and consume in one atomic UPDATE so a code can't be redeemed twice
+        consumed = cls.objects.filter(device=device, code_hash__in=code_hashes, is_used=False).update(
+            is_used=True, used_at=timezone.now()
+        )
+        return consumed == 1
@@ -3,8 +3,13 @@ Two-Factor Authentication Service.
 """
 
 import base64
+import hashlib
+import hmac
 import io
 import logging
+import time
+import unicodedata
+from functools import lru_cache
 from typing import Optional, Tuple
 
 from django.conf import settings
@@ -18,6 +23,53 @@ from .models import BackupCode, TwoFactorDevice
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _totp_hmac(secret: str) -> hmac.HMAC:
+    """
+    Return an HMAC-SHA1 object keyed with a base32 TOTP secret and no message.
+
+    Callers ``copy()`` it per time step, so the base32 decode and key schedule
+    run once per secret. Re-running setup issues a new secret, so cached
+    entries never go stale.
+    """
+    return hmac.new(pyotp.TOTP(secret).byte_secret(), digestmod=hashlib.sha1)
+
+
+def _hotp(key: hmac.HMAC, counter: int, digits: int) -> bytes:
+    """Compute the RFC 4226 code for a counter from a keyed HMAC prototype."""
+    mac = key.copy()
+    mac.update(counter.to_bytes(8, "big"))
+    digest = mac.digest()
+    offset = digest[-1] & 0x0F
+    end = offset + 4
+    value = int.from_bytes(digest[offset:end], "big") & 0x7FFFFFFF
+    return str(value % 10**digits).zfill(digits).encode()
+
+
+@lru_cache(maxsize=1024)
+def _render_qr_png(uri: str) -> bytes:
+    """
+    Render a provisioning URI as PNG bytes.
+
+    Output is deterministic for a given URI, so setup retries reuse the image
+    instead of re-running the Reed-Solomon encoding and rasterization.
+    """
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(uri)
+    qr.make(fit=True)
+
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
 class TwoFactorService:
     """Service for handling 2FA operations."""
 
@@ -26,6 +78,20 @@ class TwoFactorService:
     TOTP_INTERVAL = 30  # seconds
     TOTP_VALID_WINDOW = 1  # Allow 1 interval before/after
 
+    @classmethod
+    def get_device(cls, user) -> Optional[TwoFactorDevice]:
+        """
+        Return the user's TOTP device, or None if 2FA was never set up.
+
+        Reads the ``totp_device`` reverse one-to-one, which Django caches on the
+        user instance (misses included), so repeated 2FA checks during one
+        request query the database once.
+        """
+        try:
+            return user.totp_device
+        except TwoFactorDevice.DoesNotExist:
+            return None
+
     @classmethod
     def generate_secret(cls) -> str:
         """Generate a new TOTP secret."""
@@ -79,27 +145,10 @@ class TwoFactorService:
         """
         issuer = getattr(settings, "TWOFA_ISSUER", "Job Application Tracker")
 
-        totp = pyotp.TOTP(secret)
-        provisioning_uri = totp.provisioning_uri(name=email, issuer_name=issuer)
+        provisioning_uri = pyotp.TOTP(secret).provisioning_uri(name=email, issuer_name=issuer)
 
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(provisioning_uri)
-        qr.make(fit=True)
-
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Convert to base64
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
-
-        return base64.b64encode(buffer.getvalue()).decode()
+        # Generate QR code and convert to base64
+        return base64.b64encode(_render_qr_png(provisioning_uri)).decode()
 
     @classmethod
     def verify_totp(cls, user, code: str) -> bool:
@@ -113,20 +162,29 @@ class TwoFactorService:
         Returns:
             True if valid, False otherwise
         """
-        try:
-            device = TwoFactorDevice.objects.get(user=user)
-        except TwoFactorDevice.DoesNotExist:
+        device = cls.get_device(user)
+        if device is None:
             return False
 
-        totp = pyotp.TOTP(device.secret)
-
-        if totp.verify(code, valid_window=cls.TOTP_VALID_WINDOW):
+        if cls._totp_matches(device.secret, code):
             device.last_used_at = timezone.now()
             device.save(update_fields=["last_used_at"])
             return True
 
         return False
 
+    @classmethod
+    def _totp_matches(cls, secret: str, code: str) -> bool:
+        """Check a code against the current time step and TOTP_VALID_WINDOW steps either side."""
+        key = _totp_hmac(secret)
+        # NFKC-normalize like pyotp's strings_equal, so e.g. full-width digits still match
+        code = unicodedata.normalize("NFKC", str(code)).encode()
+        counter = int(time.time()) // cls.TOTP_INTERVAL
+        return any(
+            hmac.compare_digest(code, _hotp(key, counter + step, cls.TOTP_DIGITS))
+            for step in range(-cls.TOTP_VALID_WINDOW, cls.TOTP_VALID_WINDOW + 1)
+        )
+
     @classmethod
     def confirm_setup(cls, user, code: str) -> bool:
         """
@@ -139,9 +197,8 @@ class TwoFactorService:
         Returns:
             True if setup confirmed, False otherwise
         """
-        try:
-            device = TwoFactorDevice.objects.get(user=user)
-        except TwoFactorDevice.DoesNotExist:
+        device = cls.get_device(user)
+        if device is None:
             return False
 
         if device.is_enabled:
@@ -170,9 +227,8 @@ class TwoFactorService:
         Returns:
             True if disabled, False otherwise
         """
-        try:
-            device = TwoFactorDevice.objects.get(user=user)
-        except TwoFactorDevice.DoesNotExist:
+        device = cls.get_device(user)
+        if device is None:
             return False
 
         if not device.is_enabled:
@@ -195,27 +251,14 @@ class TwoFactorService:
     @classmethod
     def is_2fa_enabled(cls, user) -> bool:
         """Check if 2FA is enabled for a user."""
-        try:
-            device = TwoFactorDevice.objects.get(user=user)
-            return device.is_enabled
-        except TwoFactorDevice.DoesNotExist:
-            return False
+        device = cls.get_device(user)
+        return device is not None and device.is_enabled
 
     @classmethod
     def get_status(cls, user) -> dict:
         """Get 2FA status for a user."""
-        try:
-            device = TwoFactorDevice.objects.get(user=user)
-            backup_codes_remaining = BackupCode.objects.filter(device=device, is_used=False).count()
-
-            return {
-                "enabled": device.is_enabled,
-                "verified": device.is_verified,
-                "verified_at": device.verified_at,
-                "last_used_at": device.last_used_at,
-                "backup_codes_remaining": backup_codes_remaining,
-            }
-        except TwoFactorDevice.DoesNotExist:
+        device = cls.get_device(user)
+        if device is None:
             return {
                 "enabled": False,
                 "verified": False,
@@ -224,6 +267,16 @@ class TwoFactorService:
                 "backup_codes_remaining": 0,
             }
 
+        backup_codes_remaining = BackupCode.objects.filter(device=device, is_used=False).count()
+
+        return {
+            "enabled": device.is_enabled,
+            "verified": device.is_verified,
+            "verified_at": device.verified_at,
+            "last_used_at": device.last_used_at,
+            "backup_codes_remaining": backup_codes_remaining,
+        }
+
     @classmethod
     def regenerate_backup_codes(cls, user, code: str) -> Optional[list]:
         """
@@ -236,9 +289,8 @@ class TwoFactorService:
         Returns:
             List of new backup codes or None if verification failed
         """
-        try:
-            device = TwoFactorDevice.objects.get(user=user)
-        except TwoFactorDevice.DoesNotExist:
+        device = cls.get_device(user)
+        if device is None:
             return None
 
         if not device.is_enabled:
@@ -264,9 +316,8 @@ class TwoFactorService:
         Returns:
             True if valid, False otherwise
         """
-        try:
-            device = TwoFactorDevice.objects.get(user=user)
-        except TwoFactorDevice.DoesNotExist:
+        device = cls.get_device(user)
+        if device is None:
             return False
 
         return BackupCode.verify_code(device, code)
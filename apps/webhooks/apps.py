@@ -8,6 +8,14 @@ class WebhooksConfig(AppConfig):
     name = "apps.webhooks"
     verbose_name = "Webhooks"
 
+    # Serialized event catalogue for the events endpoint, built once in ready()
+    available_events = ()
+
     def ready(self):
         # Import signals
         from . import signals  # noqa
+        from .models import WebhookEndpoint
+
+        self.available_events = tuple(
+            {"name": name, "description": desc} for name, desc in WebhookEndpoint.EVENT_CHOICES
+        )
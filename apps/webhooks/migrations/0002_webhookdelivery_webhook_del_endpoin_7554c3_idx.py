@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhooks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="webhookdelivery",
+            index=models.Index(fields=["endpoint", "status", "-created_at"], name="webhook_del_endpoin_7554c3_idx"),
+        ),
+    ]
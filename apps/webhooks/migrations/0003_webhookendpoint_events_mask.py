@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-16 12:41
+
+from django.db import migrations, models
+
+# Frozen copy of WebhookEndpoint.EVENT_CHOICES order at the time of this migration
+EVENTS = [
+    "application.created",
+    "application.updated",
+    "application.deleted",
+    "application.status_changed",
+    "interview.created",
+    "interview.updated",
+    "interview.completed",
+    "interview.cancelled",
+    "company.created",
+]
+
+
+def backfill_events_mask(apps, schema_editor):
+    WebhookEndpoint = apps.get_model("webhooks", "WebhookEndpoint")
+    bits = {name: 1 << index for index, name in enumerate(EVENTS)}
+
+    endpoints = list(WebhookEndpoint.objects.only("id", "events"))
+    for endpoint in endpoints:
+        endpoint.events_mask = 0
+        for event in endpoint.events:
+            endpoint.events_mask |= bits.get(event, 0)
+    WebhookEndpoint.objects.bulk_update(endpoints, ["events_mask"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhooks", "0002_webhookdelivery_webhook_del_endpoin_7554c3_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhookendpoint",
+            name="events_mask",
+            field=models.BigIntegerField(default=0, editable=False, help_text="Bitmask of subscribed events"),
+        ),
+        migrations.RunPython(backfill_events_mask, migrations.RunPython.noop),
+    ]
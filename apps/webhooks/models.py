@@ -24,12 +24,27 @@ class WebhookEndpoint(models.Model):
         ("company.created", "Company Created"),
     ]
 
+    # Bit stored in events_mask for each event; must match the list frozen in
+    # migration 0003. Never change or reuse a value: give new events the next free bit.
+    EVENT_BITS = {
+        "application.created": 1 << 0,
+        "application.updated": 1 << 1,
+        "application.deleted": 1 << 2,
+        "application.status_changed": 1 << 3,
+        "interview.created": 1 << 4,
+        "interview.updated": 1 << 5,
+        "interview.completed": 1 << 6,
+        "interview.cancelled": 1 << 7,
+        "company.created": 1 << 8,
+    }
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="webhook_endpoints")
     name = models.CharField(max_length=100, help_text="Friendly name for this webhook")
     url = models.URLField(help_text="URL to send webhook payloads to")
     secret = models.CharField(max_length=64, help_text="Secret for HMAC signature verification")
     events = models.JSONField(default=list, help_text="List of events to subscribe to")
+    events_mask = models.BigIntegerField(default=0, editable=False, help_text="Bitmask of subscribed events")
     is_active = models.BooleanField(default=True)
 
     # Metadata
@@ -54,8 +69,20 @@ class WebhookEndpoint(models.Model):
     def save(self, *args, **kwargs):
         if not self.secret:
             self.secret = secrets.token_hex(32)
+        self.events_mask = self.events_to_mask(self.events)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "events" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "events_mask"}
         super().save(*args, **kwargs)
 
+    @classmethod
+    def events_to_mask(cls, events):
+        """Combine event names into a subscription bitmask, ignoring unknown names."""
+        mask = 0
+        for event in events:
+            mask |= cls.EVENT_BITS.get(event, 0)
+        return mask
+
     def regenerate_secret(self):
         """Generate a new secret."""
         self.secret = secrets.token_hex(32)
@@ -100,6 +127,7 @@ class WebhookDelivery(models.Model):
         indexes = [
             models.Index(fields=["status", "next_retry_at"]),
             models.Index(fields=["endpoint", "created_at"]),
+            models.Index(fields=["endpoint", "status", "-created_at"]),
         ]
 
     def __str__(self):
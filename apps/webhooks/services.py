@@ -4,20 +4,63 @@ Webhook Service - Handle webhook delivery with retries and signing.
 
 import hashlib
 import hmac
-import json
 import logging
 import time
 from datetime import timedelta
+from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 
+from django.db.models import F
 from django.utils import timezone
 
 import httpx
+import orjson
 
 from .models import WebhookDelivery, WebhookEndpoint
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _hmac_prototype(secret: str) -> hmac.HMAC:
+    """
+    Return a keyed HMAC-SHA256 object with no message data.
+
+    Callers ``copy()`` it, which skips re-deriving the inner/outer key pads on
+    every delivery to the same endpoint. Regenerated secrets get a new entry.
+    """
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+@lru_cache(maxsize=None)
+def _http_client() -> httpx.Client:
+    """
+    Return this process's pooled HTTP client for webhook delivery.
+
+    Created lazily so each forked Celery worker opens its own connections;
+    keep-alive then reuses TCP/TLS sessions across deliveries to the same host.
+    The client is shared by every user's endpoints, so its cookie jar rejects
+    all cookies; otherwise a Set-Cookie from one endpoint would be replayed to
+    others on the same host.
+    """
+    return httpx.Client(
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+    )
+
+
+def _encode_payload(payload: dict) -> bytes:
+    """Serialize a webhook payload to the exact bytes that are signed and sent."""
+    return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def close_http_client():
+    """Close the pooled HTTP client, if this process created one."""
+    if _http_client.cache_info().currsize:
+        _http_client().close()
+        _http_client.cache_clear()
+
+
 class WebhookService:
     """Service for dispatching webhooks."""
 
@@ -25,18 +68,47 @@ class WebhookService:
     TIMEOUT = 30  # seconds
 
     @classmethod
-    def generate_signature(cls, payload: str, secret: str) -> str:
+    def generate_signature(cls, payload: bytes | str, secret: str) -> str:
         """
         Generate HMAC-SHA256 signature for payload.
 
         Args:
-            payload: JSON payload as string
+            payload: JSON payload as bytes (or a string, encoded as UTF-8)
             secret: Webhook secret
 
         Returns:
             Hex-encoded signature
         """
-        return hmac.new(secret.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256).hexdigest()
+        return cls._mac(payload, secret).hexdigest()
+
+    @classmethod
+    def verify_signature(cls, payload: bytes | str, signature: str, secret: str) -> bool:
+        """
+        Check a signature against the payload in constant time.
+
+        Args:
+            payload: Raw request body as bytes (or a string, encoded as UTF-8)
+            signature: Hex signature, with or without the "sha256=" header prefix
+            secret: Webhook secret
+
+        Returns:
+            True if the signature matches
+        """
+        signature = signature.removeprefix("sha256=")
+        try:
+            received = bytes.fromhex(signature)
+        except ValueError:
+            return False
+        return hmac.compare_digest(cls._mac(payload, secret).digest(), received)
+
+    @staticmethod
+    def _mac(payload: bytes | str, secret: str) -> hmac.HMAC:
+        """Return the HMAC-SHA256 of payload, keyed from the cached prototype."""
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        mac = _hmac_prototype(secret).copy()
+        mac.update(payload)
+        return mac
 
     @classmethod
     def dispatch_event(cls, event: str, data: dict, user_id: int):
@@ -50,23 +122,32 @@ class WebhookService:
         """
         from .tasks import deliver_webhook
 
-        endpoints = WebhookEndpoint.objects.filter(
-            user_id=user_id, is_active=True, failure_count__lt=10  # Disable after 10 consecutive failures
+        event_bit = WebhookEndpoint.EVENT_BITS.get(event)
+        if event_bit is None:
+            return
+
+        # Subscription is checked in SQL with an integer AND on the events bitmask
+        endpoints = (
+            WebhookEndpoint.objects.filter(
+                user_id=user_id, is_active=True, failure_count__lt=10  # Disable after 10 consecutive failures
+            )
+            .alias(subscribed=F("events_mask").bitand(event_bit))
+            .filter(subscribed__gt=0)
+            .only("id", "name")
         )
 
-        for endpoint in endpoints:
-            if event in endpoint.events:
-                # Create delivery record
-                delivery = WebhookDelivery.objects.create(
-                    endpoint=endpoint,
-                    event=event,
-                    payload={"event": event, "timestamp": timezone.now().isoformat(), "data": data},
-                )
+        payload = {"event": event, "timestamp": timezone.now().isoformat(), "data": data}
+
+        # Create all delivery records in one INSERT
+        deliveries = WebhookDelivery.objects.bulk_create(
+            [WebhookDelivery(endpoint=endpoint, event=event, payload=payload) for endpoint in endpoints]
+        )
 
-                # Queue for delivery
-                deliver_webhook.delay(str(delivery.id))
+        # Queue each delivery separately so endpoints are retried independently
+        for delivery in deliveries:
+            deliver_webhook.delay(str(delivery.id))
 
-                logger.info(f"Queued webhook delivery {delivery.id} for {event} to {endpoint.name}")
+            logger.info(f"Queued webhook delivery {delivery.id} for {event} to {delivery.endpoint.name}")
 
     @classmethod
     def deliver(cls, delivery: WebhookDelivery) -> bool:
@@ -80,8 +161,8 @@ class WebhookService:
             True if successful, False otherwise
         """
         endpoint = delivery.endpoint
-        payload_json = json.dumps(delivery.payload, default=str)
-        signature = cls.generate_signature(payload_json, endpoint.secret)
+        body = _encode_payload(delivery.payload)
+        signature = cls.generate_signature(body, endpoint.secret)
 
         headers = {
             "Content-Type": "application/json",
@@ -95,8 +176,7 @@ class WebhookService:
         delivery.attempt_count += 1
 
         try:
-            with httpx.Client(timeout=cls.TIMEOUT) as client:
-                response = client.post(endpoint.url, content=payload_json, headers=headers)
+            response = _http_client().post(endpoint.url, content=body, headers=headers, timeout=cls.TIMEOUT)
 
             delivery.response_status_code = response.status_code
             delivery.response_body = response.text[:1000]  # Limit stored response
@@ -191,8 +271,8 @@ class WebhookService:
             },
         }
 
-        payload_json = json.dumps(test_payload, default=str)
-        signature = cls.generate_signature(payload_json, endpoint.secret)
+        body = _encode_payload(test_payload)
+        signature = cls.generate_signature(body, endpoint.secret)
 
         headers = {
             "Content-Type": "application/json",
@@ -204,8 +284,7 @@ class WebhookService:
         }
 
         try:
-            with httpx.Client(timeout=10) as client:
-                response = client.post(endpoint.url, content=payload_json, headers=headers)
+            response = _http_client().post(endpoint.url, content=body, headers=headers, timeout=10)
 
             return {
                 "success": 200 <= response.status_code < 300,
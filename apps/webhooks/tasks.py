@@ -5,12 +5,21 @@ Webhook Celery Tasks.
 import logging
 
 from celery import shared_task
+from celery.signals import worker_process_shutdown
 
 from .models import WebhookDelivery
 
 logger = logging.getLogger(__name__)
 
 
+@worker_process_shutdown.connect
+def close_webhook_http_client(**kwargs):
+    """Close pooled webhook connections when a worker process exits."""
+    from .services import close_http_client
+
+    close_http_client()
+
+
 @shared_task(
     name="webhooks.deliver_webhook",
     bind=True,
@@ -2,6 +2,8 @@
 Webhook Views - API endpoints for managing webhooks.
 """
 
+from django.apps import apps
+
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -105,9 +107,7 @@ class WebhookEndpointViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def events(self, request):
         """List available webhook events."""
-        return Response(
-            {"events": [{"name": name, "description": desc} for name, desc in WebhookEndpoint.EVENT_CHOICES]}
-        )
+        return Response({"events": apps.get_app_config("webhooks").available_events})
 
 
 @extend_schema_view(
@@ -121,7 +121,24 @@ class WebhookDeliveryViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = WebhookDeliverySerializer
 
     def get_queryset(self):
-        queryset = WebhookDelivery.objects.filter(endpoint__user=self.request.user).select_related("endpoint")
+        # Load only the columns WebhookDeliverySerializer renders (skips response_body)
+        queryset = (
+            WebhookDelivery.objects.filter(endpoint__user=self.request.user)
+            .select_related("endpoint")
+            .only(
+                "id",
+                "endpoint__name",
+                "event",
+                "payload",
+                "status",
+                "attempt_count",
+                "max_attempts",
+                "response_status_code",
+                "error_message",
+                "created_at",
+                "delivered_at",
+            )
+        )
 
         # Filter by endpoint
         endpoint_id = self.request.query_params.get("endpoint")
@@ -198,6 +198,9 @@ AI_ASYNC_ENABLED = os.environ.get("AI_ASYNC_ENABLED", "true").lower() == "true"
 
 # 2FA Settings
 TWOFA_ISSUER = "Job Application Tracker"
+# Key for hashing backup codes; falls back to SECRET_KEY (and SECRET_KEY_FALLBACKS
+# when verifying, so rotating SECRET_KEY keeps existing codes valid) when unset
+TWOFA_CODE_PEPPER = os.environ.get("TWOFA_CODE_PEPPER", "")
 
 
 # Celery Beat Schedule
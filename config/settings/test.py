@@ -0,0 +1,16 @@
+"""
+Test settings for Job Application Tracker.
+Used by pytest; development settings plus test-only configuration.
+"""
+
+from .development import *  # noqa: F401,F403
+from .development import REST_FRAMEWORK
+
+# DRF test client/factory: encode JSON request bodies with msgspec (dev requirement)
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "TEST_REQUEST_RENDERER_CLASSES": [
+        "rest_framework.renderers.MultiPartRenderer",
+        "tests.renderers.MsgspecJSONRenderer",
+    ],
+}
@@ -4,8 +4,83 @@ Protects against prompt injection attacks and cleans user input.
 """
 
 import re
+import threading
 from typing import Optional
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+# str.translate table deleting control characters other than tab/newline/carriage return
+_CONTROL_CHARS_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+
+# One pass that collapses runs of spaces/tabs to a single space and caps blank
+# lines at one. A lone space is not matched, so ordinary text is left alone.
+_WHITESPACE_RE = re.compile(r"(?P<spaces> [ \t]+|\t[ \t]*)|(?P<newlines>\n{3,})")
+_WHITESPACE_REPLACEMENTS = {"spaces": " ", "newlines": "\n\n"}
+
+# After str.lower(), the only characters re.IGNORECASE still matches to an ASCII
+# letter (dotless i, long s). Folding them lets indicators be matched as plain
+# lowercase text with the same verdicts as IGNORECASE over text.lower().
+_ASCII_CASE_VARIANTS = str.maketrans({"\u0131": "i", "\u017f": "s"})
+
+# Possessive "++" / "*+" / "?+" in a pattern's source, for stripping before Hyperscan
+_POSSESSIVE_RE = re.compile(r"(?<!\\)([+*?])\+")
+
+_COMPANY_NAME_DISALLOWED_RE = re.compile(r"[^\w\s\-\.\,\&\'\"]")
+_JOB_TITLE_DISALLOWED_RE = re.compile(r"[^\w\s\-\.\,\(\)\+\#\/]")
+
+
+def _build_phrase_automaton(phrases):
+    """Build an Aho-Corasick automaton over lowercase phrases, or None if pyahocorasick is missing."""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_injection_database(patterns, phrases):
+    """
+    Compile injection regexes and literal phrases into one Hyperscan database.
+
+    Returns None if Hyperscan is not installed, in which case detection falls
+    back to the Aho-Corasick automaton plus the compiled ``re`` patterns.
+    """
+    if hyperscan is None:
+        return None
+
+    # Hyperscan has no possessive quantifiers; it never backtracks, so plain ones
+    # match the same text. Its UCP \s also lacks the \x1c-\x1f separators that
+    # Python's Unicode \s includes, so add them back.
+    expressions = [_POSSESSIVE_RE.sub(r"\1", p).replace(r"\s", r"[\s\x1c-\x1f]").encode("utf-8") for p in patterns]
+    expressions += [re.escape(p).encode("utf-8") for p in phrases]
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[flags] * len(expressions),
+    )
+    return database
+
+
+def _stop_on_first_match(id, start, end, flags, context):
+    """Hyperscan match handler: record the hit and return True to terminate the scan."""
+    context.append(id)
+    return True
+
 
 class PromptSanitizer:
     """
@@ -13,22 +88,44 @@ class PromptSanitizer:
     Prevents prompt injection and removes potentially harmful content.
     """
 
-    # Patterns that might indicate prompt injection attempts
+    # Patterns that might indicate prompt injection attempts. Used with search(),
+    # so none needs a leading or trailing ".*". Whitespace runs are possessive:
+    # each is followed by a non-space token, so giving characters back can never
+    # help and a long run of spaces costs one pass instead of a backtrack per char.
     INJECTION_PATTERNS = [
-        r"ignore\s+(all\s+)?(previous|above|prior)\s+(instructions?|prompts?)",
-        r"disregard\s+(all\s+)?(previous|above|prior)",
-        r"forget\s+(everything|all|your)\s+(instructions?|rules?|prompts?)",
-        r"you\s+are\s+now\s+(a|an)\s+",
-        r"act\s+as\s+(a|an|if)",
-        r"pretend\s+(to\s+be|you\s+are)",
-        r"new\s+instructions?:",
-        r"system\s*:\s*",
-        r"\[system\]",
-        r"\[INST\]",
-        r"<\|im_start\|>",
-        r"<\|im_end\|>",
+        r"ignore\s++(?:all\s++)?(?:previous|above|prior)\s++(?:instructions?|prompts?)",
+        r"disregard\s++(?:all\s++)?(?:previous|above|prior)",
+        r"forget\s++(?:everything|all|your)\s++(?:instructions?|rules?|prompts?)",
+        r"you\s++are\s++now\s++(?:a|an)\s",
+        r"act\s++as\s++(?:a|an|if)",
+        r"pretend\s++(?:to\s++be|you\s++are)",
+        r"new\s++instructions?:",
+        r"system\s*+:",
+    ]
+
+    # Fixed chat-template markers, matched as case-folded substrings in one pass
+    INJECTION_PHRASES = [
+        "[system]",
+        "[inst]",
+        "<|im_start|>",
+        "<|im_end|>",
     ]
 
+    # Every indicator above contains at least one of these words (compared
+    # against the folded text), so text without any of them can skip the full scan
+    INJECTION_TRIGGERS = frozenset(
+        ["ignore", "disregard", "forget", "now", "act", "pretend", "instruction", "system", "[inst]", "<|im_"]
+    )
+
+    # Compiled once at import; detect_injection runs on every AI-bound request
+    _COMPILED_INJECTION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in INJECTION_PATTERNS)
+    _INJECTION_AUTOMATON = _build_phrase_automaton(INJECTION_PHRASES)
+
+    # Optional: every indicator in a single SIMD pass. Scratch space can't be
+    # shared by concurrent scans, so each thread allocates its own on first use.
+    _INJECTION_DATABASE = _build_injection_database(INJECTION_PATTERNS, INJECTION_PHRASES)
+    _INJECTION_SCRATCH = threading.local()
+
     # Maximum lengths for different input types
     MAX_LENGTHS = {
         "job_description": 10000,
@@ -66,13 +163,10 @@ class PromptSanitizer:
             text = text[:max_length] + "..."
 
         # Remove null bytes and control characters (except newlines/tabs)
-        text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text)
+        text = text.translate(_CONTROL_CHARS_TABLE)
 
         # Normalize whitespace (but preserve paragraph breaks)
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-
-        return text
+        return _WHITESPACE_RE.sub(lambda m: _WHITESPACE_REPLACEMENTS[m.lastgroup], text)
 
     @classmethod
     def detect_injection(cls, text: str) -> bool:
@@ -88,13 +182,49 @@ class PromptSanitizer:
         if not text:
             return False
 
-        text_lower = text.lower()
+        # Fast path: every indicator needs whitespace or punctuation and a trigger word
+        if text.isalnum():
+            return False
+        text_folded = text.lower().translate(_ASCII_CASE_VARIANTS)
+        if not any(trigger in text_folded for trigger in cls.INJECTION_TRIGGERS):
+            return False
+
+        if cls._INJECTION_DATABASE is not None:
+            try:
+                data = text_folded.encode("utf-8")
+            except UnicodeEncodeError:
+                # Lone surrogates (JSON allows "\ud800") have no UTF-8 form; the re path handles them
+                pass
+            else:
+                return cls._scan_injection_database(data)
+
+        if cls._contains_injection_phrase(text_folded):
+            return True
 
-        for pattern in cls.INJECTION_PATTERNS:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                return True
+        return any(pattern.search(text_folded) for pattern in cls._COMPILED_INJECTION_PATTERNS)
 
-        return False
+    @classmethod
+    def _scan_injection_database(cls, data: bytes) -> bool:
+        """Scan UTF-8 encoded text with the Hyperscan database, stopping at the first indicator."""
+        scratch = getattr(cls._INJECTION_SCRATCH, "scratch", None)
+        if scratch is None:
+            scratch = cls._INJECTION_SCRATCH.scratch = hyperscan.Scratch(cls._INJECTION_DATABASE)
+
+        matches = []
+        try:
+            cls._INJECTION_DATABASE.scan(
+                data, match_event_handler=_stop_on_first_match, context=matches, scratch=scratch
+            )
+        except hyperscan.ScanTerminated:
+            pass
+        return bool(matches)
+
+    @classmethod
+    def _contains_injection_phrase(cls, text_folded: str) -> bool:
+        """Check case-folded text for any fixed injection marker."""
+        if cls._INJECTION_AUTOMATON is not None:
+            return next(cls._INJECTION_AUTOMATON.iter(text_folded), None) is not None
+        return any(phrase in text_folded for phrase in cls.INJECTION_PHRASES)
 
     @classmethod
     def sanitize_for_ai(
@@ -138,7 +268,7 @@ class PromptSanitizer:
         """Sanitize company name - more strict."""
         sanitized = cls.sanitize(text, "company_name")
         # Remove any special characters except basic punctuation
-        sanitized = re.sub(r"[^\w\s\-\.\,\&\'\"]", "", sanitized)
+        sanitized = _COMPANY_NAME_DISALLOWED_RE.sub("", sanitized)
         return sanitized
 
     @classmethod
@@ -146,5 +276,5 @@ class PromptSanitizer:
         """Sanitize job title - more strict."""
         sanitized = cls.sanitize(text, "job_title")
         # Remove any special characters except basic punctuation
-        sanitized = re.sub(r"[^\w\s\-\.\,\(\)\+\#\/]", "", sanitized)
+        sanitized = _JOB_TITLE_DISALLOWED_RE.sub("", sanitized)
         return sanitized
@@ -2,15 +2,137 @@
 Test configuration and fixtures for Job Application Tracker.
 """
 
+import copy
+import csv
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
 from django.contrib.auth import get_user_model
 
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 
 import pytest
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
 User = get_user_model()
 
+EMAIL_SENDERS = (
+    "send_verification_email",
+    "send_password_reset_email",
+    "send_welcome_email",
+    "send_password_changed_email",
+)
+
+FAST_DB_SETTINGS = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+
+# Password strength is irrelevant in tests; MD5 keeps create_user and
+# check_password sub-millisecond instead of paying for PBKDF2 iterations.
+TEST_PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Test phases slower than this (seconds) are appended to SLOW_TESTS_CSV,
+# which drives the next round of fixture consolidation.
+SLOW_TEST_THRESHOLD = 0.3
+SLOW_TESTS_CSV = Path(__file__).resolve().parent.parent / "slow_tests.csv"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--fast-db",
+        action="store_true",
+        default=False,
+        help="Run only fast_db-marked tests against an in-memory SQLite database.",
+    )
+
+
+def pytest_configure(config):
+    from django.conf import settings
+
+    settings.PASSWORD_HASHERS = TEST_PASSWORD_HASHERS
+
+    # Start each run with a fresh slow-test report; xdist workers leave it to the controller
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        SLOW_TESTS_CSV.unlink(missing_ok=True)
+
+    # TEST_DB=sqlite runs the whole suite on in-memory SQLite; CI leaves it
+    # unset so the production dialect (Postgres) is still exercised.
+    if config.getoption("--fast-db") or os.environ.get("TEST_DB") == "sqlite":
+        from django.db import connections
+
+        # Django is already set up by the time conftest hooks run, so swap the
+        # engine in place and drop the cached connection for the default alias.
+        settings.DATABASES["default"].update(FAST_DB_SETTINGS)
+        del connections["default"]
+
+
+def _uses_transactional_db(item):
+    """Return True if a test asks pytest-django for a flushed (TransactionTestCase-style) database."""
+    if {"transactional_db", "live_server"} & set(item.fixturenames):
+        return True
+    marker = item.get_closest_marker("django_db")
+    if marker is None:
+        return False
+    transaction = marker.kwargs.get("transaction", marker.args[0] if marker.args else False)
+    return bool(transaction or marker.kwargs.get("reset_sequences"))
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Refuse transactional tests, then, with --fast-db, deselect tests that have
+    not opted in via the fast_db marker.
+    """
+    # Transactional tests flush every table at teardown, which would delete the
+    # rows committed_rows fixtures share across tests in the same worker.
+    transactional = [item.nodeid for item in items if _uses_transactional_db(item)]
+    if transactional:
+        raise pytest.UsageError(
+            "Transactional database tests would flush the rows shared by committed_rows fixtures: "
+            + ", ".join(transactional)
+        )
+
+    if not config.getoption("--fast-db"):
+        return
+
+    selected, deselected = [], []
+    for item in items:
+        (selected if item.get_closest_marker("fast_db") else deselected).append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_runtest_logreport(report):
+    """Record slow setup/call/teardown phases in SLOW_TESTS_CSV as ``nodeid,phase,duration``."""
+    # xdist forwards worker reports to the controller, so only write there
+    if os.environ.get("PYTEST_XDIST_WORKER") or report.duration <= SLOW_TEST_THRESHOLD:
+        return
+
+    new_file = not SLOW_TESTS_CSV.exists()
+    with SLOW_TESTS_CSV.open("a", newline="") as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(["nodeid", "phase", "duration"])
+        writer.writerow([report.nodeid, report.when, f"{report.duration:.3f}"])
+
+
+@pytest.fixture(autouse=True)
+def mock_email(monkeypatch):
+    """
+    Stub out the transactional EmailService senders for every test.
+
+    Tests that assert on sent emails take this fixture and inspect e.g.
+    ``mock_email.send_verification_email.called``.
+    """
+    from services.email_service import EmailService
+
+    mocks = {}
+    for name in EMAIL_SENDERS:
+        mocks[name] = Mock(return_value={"success": True, "id": "test-id"})
+        monkeypatch.setattr(EmailService, name, mocks[name])
+    return SimpleNamespace(**mocks)
+
 
 @pytest.fixture
 def api_client():
@@ -19,11 +141,76 @@ def api_client():
 
 
 @pytest.fixture
-def user(db):
-    """Create and return a test user."""
-    return User.objects.create_user(
-        username="testuser", email="testuser@example.com", password="testpass123", first_name="Test", last_name="User"
-    )
+def api_rf():
+    """Return an API request factory for calling views directly, skipping URL routing and middleware."""
+    return APIRequestFactory()
+
+
+@pytest.fixture(scope="session")
+def committed_rows(django_db_setup, django_db_blocker):
+    """
+    Return a helper for data shared by class-, module- or session-scoped fixtures.
+
+    ``yield from committed_rows(create)`` calls ``create()`` outside the per-test
+    transactions, yields the model instance or list of instances it returns, and
+    deletes them (last first) when the fixture's scope ends; deleting a parent
+    cascades to its children. Each test's own writes to the rows still roll back,
+    so function-scoped fixtures hand tests a ``copy.deepcopy`` of the instance.
+
+    Tests using ``transaction=True`` would flush these rows for every later test
+    in the worker; ``pytest_collection_modifyitems`` rejects them.
+    """
+
+    def commit(create):
+        with django_db_blocker.unblock():
+            rows = create()
+        yield rows
+        with django_db_blocker.unblock():
+            for row in reversed(rows if isinstance(rows, list) else [rows]):
+                row.delete()
+
+    return commit
+
+
+@pytest.fixture(scope="session")
+def session_user(committed_rows):
+    """Create the shared test user once per session, outside the per-test transactions."""
+
+    def create():
+        # An interrupted run (Ctrl-C, crashed xdist worker) skips teardown and leaves
+        # the user committed in the --reuse-db database; clear it and, by cascade,
+        # anything other session/class fixtures committed for it.
+        User.objects.filter(email="testuser@example.com").delete()
+        return User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+
+    yield from committed_rows(create)
+
+
+@pytest.fixture
+def groq_response():
+    """Return a factory for mocked GroqService results."""
+
+    def make(key, text="ok", tokens=100, model="llama-3.3-70b-versatile"):
+        return {key: text, "model": model, "usage": {"total_tokens": tokens}}
+
+    return make
+
+
+@pytest.fixture
+def user(db, session_user):
+    """
+    Return the shared test user.
+
+    Each test gets its own copy of the instance; database changes are rolled
+    back with the test transaction, so tests may freely mutate the user.
+    """
+    return copy.deepcopy(session_user)
 
 
 @pytest.fixture
@@ -50,12 +237,17 @@ def another_user(db):
     )
 
 
+@pytest.fixture(scope="session")
+def auth_token(session_user):
+    """Issue an access token for the shared test user once per session."""
+    return str(AccessToken.for_user(session_user))
+
+
 @pytest.fixture
-def auth_client(user):
-    """Return an authenticated API client."""
+def auth_client(auth_token):
+    """Return an authenticated API client, reusing the session's cached access token."""
     client = APIClient()
-    refresh = RefreshToken.for_user(user)
-    client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {auth_token}")
     return client
 
 
@@ -68,19 +260,33 @@ def auth_client_user2(user2):
     return client
 
 
-@pytest.fixture
-def company(db, user):
-    """Create and return a test company."""
+@pytest.fixture(scope="session")
+def session_company(committed_rows, session_user):
+    """Create the shared test company once per session, outside the per-test transactions."""
     from apps.companies.models import Company
 
-    return Company.objects.create(
-        user=user,
-        name="Test Company",
-        website="https://testcompany.com",
-        industry="Technology",
-        size="51-200",
-        location="San Francisco, CA",
-    )
+    def create():
+        company, _ = Company.objects.get_or_create(
+            user=session_user,
+            name="Test Company",
+            defaults={
+                "website": "https://testcompany.com",
+                "industry": "Technology",
+                "size": "51-200",
+                "location": "San Francisco, CA",
+            },
+        )
+        return company
+
+    yield from committed_rows(create)
+
+
+@pytest.fixture
+def company(db, user, session_company):
+    """Return the shared test company owned by ``user``."""
+    company = copy.deepcopy(session_company)
+    company.user = user
+    return company
 
 
 @pytest.fixture
@@ -0,0 +1,16 @@
+"""
+Request renderers used by the DRF test client and request factory.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+import msgspec
+
+
+class MsgspecJSONRenderer(JSONRenderer):
+    """Encode ``format="json"`` test request bodies with msgspec instead of stdlib json."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgspec.json.encode(data)
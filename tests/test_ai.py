@@ -10,6 +10,13 @@ from rest_framework import status
 
 import pytest
 
+from apps.ai.models import GeneratedContent
+
+COVER_LETTER_GENERATE_URL = reverse("cover-letter-generate")
+JOB_MATCH_ANALYZE_URL = reverse("job-match-analyze")
+INTERVIEW_QUESTIONS_GENERATE_URL = reverse("interview-questions-generate")
+AI_HISTORY_LIST_URL = reverse("ai-history-list")
+
 
 @pytest.mark.django_db
 class TestCoverLetterGeneration:
@@ -17,27 +24,20 @@ class TestCoverLetterGeneration:
 
     def test_cover_letter_unauthenticated(self, api_client):
         """Test that cover letter requires auth."""
-        url = reverse("cover-letter-generate")
-        response = api_client.post(url, {}, format="json")
+        response = api_client.generic("POST", COVER_LETTER_GENERATE_URL)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
     def test_cover_letter_missing_fields(self, auth_client):
         """Test that required fields are validated."""
-        url = reverse("cover-letter-generate")
         data = {"job_title": "Engineer"}  # Missing required fields
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(COVER_LETTER_GENERATE_URL, data, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     @patch("apps.ai.views.GroqService.generate_cover_letter")
-    def test_cover_letter_success(self, mock_generate, auth_client):
+    def test_cover_letter_success(self, mock_generate, auth_client, groq_response):
         """Test successful cover letter generation."""
-        mock_generate.return_value = {
-            "cover_letter": "Dear Hiring Manager...",
-            "model": "llama-3.3-70b-versatile",
-            "usage": {"total_tokens": 500},
-        }
+        mock_generate.return_value = groq_response("cover_letter", "Dear Hiring Manager...", tokens=500)
 
-        url = reverse("cover-letter-generate")
         data = {
             "job_description": "We are looking for a software engineer with Python experience...",
             "resume_text": "Experienced software engineer with 5 years of Python development...",
@@ -47,7 +47,7 @@ class TestCoverLetterGeneration:
             "save_to_history": False,
             "async_mode": False,  # Force sync mode for testing
         }
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(COVER_LETTER_GENERATE_URL, data, format="json")
         assert response.status_code == status.HTTP_200_OK
         assert "cover_letter" in response.data
 
@@ -58,27 +58,23 @@ class TestJobMatchAnalysis:
 
     def test_job_match_unauthenticated(self, api_client):
         """Test that job match requires auth."""
-        url = reverse("job-match-analyze")
-        response = api_client.post(url, {}, format="json")
+        response = api_client.generic("POST", JOB_MATCH_ANALYZE_URL)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
     @patch("apps.ai.views.GroqService.analyze_job_match")
-    def test_job_match_success(self, mock_analyze, auth_client):
+    def test_job_match_success(self, mock_analyze, auth_client, groq_response):
         """Test successful job match analysis."""
-        mock_analyze.return_value = {
-            "analysis": '{"match_score": 85, "matching_skills": ["Python"]}',
-            "model": "llama-3.3-70b-versatile",
-            "usage": {"total_tokens": 300},
-        }
+        mock_analyze.return_value = groq_response(
+            "analysis", '{"match_score": 85, "matching_skills": ["Python"]}', tokens=300
+        )
 
-        url = reverse("job-match-analyze")
         data = {
             "job_description": "Looking for a Python developer with strong Django experience, REST APIs, testing, and cloud deployment skills.",
             "resume_text": "Python developer with 5 years experience...",
             "save_to_history": False,
             "async_mode": False,  # Force sync mode for testing
         }
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(JOB_MATCH_ANALYZE_URL, data, format="json")
         assert response.status_code == status.HTTP_200_OK
         assert "analysis" in response.data
 
@@ -89,20 +85,14 @@ class TestInterviewQuestions:
 
     def test_interview_questions_unauthenticated(self, api_client):
         """Test that interview questions requires auth."""
-        url = reverse("interview-questions-generate")
-        response = api_client.post(url, {}, format="json")
+        response = api_client.generic("POST", INTERVIEW_QUESTIONS_GENERATE_URL)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
     @patch("apps.ai.views.GroqService.generate_interview_questions")
-    def test_interview_questions_success(self, mock_generate, auth_client):
+    def test_interview_questions_success(self, mock_generate, auth_client, groq_response):
         """Test successful interview question generation."""
-        mock_generate.return_value = {
-            "questions": "1. Tell me about yourself...",
-            "model": "llama-3.3-70b-versatile",
-            "usage": {"total_tokens": 400},
-        }
+        mock_generate.return_value = groq_response("questions", "1. Tell me about yourself...", tokens=400)
 
-        url = reverse("interview-questions-generate")
         data = {
             "job_description": "Looking for a backend engineer experienced with Python, Django, PostgreSQL, Redis, and RESTful API design.",
             "company_name": "Tech Corp",
@@ -111,7 +101,7 @@ class TestInterviewQuestions:
             "save_to_history": False,
             "async_mode": False,  # Force sync mode for testing
         }
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(INTERVIEW_QUESTIONS_GENERATE_URL, data, format="json")
         assert response.status_code == status.HTTP_200_OK
         assert "questions" in response.data
 
@@ -122,23 +112,20 @@ class TestAIHistory:
 
     def test_history_list_empty(self, auth_client):
         """Test empty history list."""
-        url = reverse("ai-history-list")
-        response = auth_client.get(url)
+        response = auth_client.get(AI_HISTORY_LIST_URL)
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", response.data)
+        results = response.data["results"]
         assert len(results) == 0
 
-    def test_history_isolation(self, auth_client, auth_client_user2, user):
+    def test_history_isolation(self, auth_client, auth_client_user2, user, django_assert_max_num_queries):
         """Test users only see their own history."""
-        from apps.ai.models import GeneratedContent
-
         GeneratedContent.objects.create(
             user=user, content_type="cover_letter", output_content="Test content", model_used="test-model"
         )
 
         # User2 should not see user1's history
-        url = reverse("ai-history-list")
-        response = auth_client_user2.get(url)
+        with django_assert_max_num_queries(3):
+            response = auth_client_user2.get(AI_HISTORY_LIST_URL)
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", response.data)
+        results = response.data["results"]
         assert len(results) == 0
@@ -2,28 +2,70 @@
 Tests for Analytics endpoints.
 """
 
+from datetime import date
+
 from django.urls import reverse
 
 from rest_framework import status
 
 import pytest
 
+from apps.applications.models import Application
+
+DASHBOARD_URL = reverse("dashboard")
+RESPONSE_RATE_URL = reverse("response_rate")
+STATUS_FUNNEL_URL = reverse("status_funnel")
+WEEKLY_ACTIVITY_URL = reverse("weekly_activity")
+HEALTH_CHECK_URL = reverse("health_check")
+LIVENESS_CHECK_URL = reverse("liveness_check")
+READINESS_CHECK_URL = reverse("readiness_check")
+
 
 @pytest.mark.django_db
 class TestDashboard:
     """Test dashboard endpoint."""
 
-    def test_dashboard_authenticated(self, auth_client, application, interview):
+    def test_dashboard_authenticated(self, auth_client, application, interview, django_assert_max_num_queries):
         """Test dashboard returns data."""
-        url = reverse("dashboard")
-        response = auth_client.get(url)
+        with django_assert_max_num_queries(6):
+            response = auth_client.get(DASHBOARD_URL)
         assert response.status_code == status.HTTP_200_OK
         assert "total_applications" in response.data
 
+    def test_dashboard_avg_response_days(self, auth_client, user, company):
+        """Test average response time is aggregated in days."""
+        Application.objects.bulk_create(
+            [
+                Application(
+                    user=user,
+                    company=company,
+                    job_title="Job 1",
+                    status="screening",
+                    applied_date=date(2024, 1, 1),
+                    response_date=date(2024, 1, 4),
+                ),
+                Application(
+                    user=user,
+                    company=company,
+                    job_title="Job 2",
+                    status="rejected",
+                    applied_date=date(2024, 1, 1),
+                    response_date=date(2024, 1, 7),
+                ),
+                Application(user=user, company=company, job_title="Job 3", status="applied"),
+            ]
+        )
+
+        response = auth_client.get(DASHBOARD_URL)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_applications"] == 3
+        assert response.data["active_applications"] == 2
+        assert response.data["response_rate"] == 66.7
+        assert response.data["avg_response_days"] == 4.5
+
     def test_dashboard_unauthenticated(self, api_client):
         """Test dashboard requires auth."""
-        url = reverse("dashboard")
-        response = api_client.get(url)
+        response = api_client.get(DASHBOARD_URL)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
@@ -33,20 +75,17 @@ class TestAnalyticsEndpoints:
 
     def test_response_rate(self, auth_client, application):
         """Test response rate endpoint."""
-        url = reverse("response_rate")
-        response = auth_client.get(url)
+        response = auth_client.get(RESPONSE_RATE_URL)
         assert response.status_code == status.HTTP_200_OK
 
     def test_status_funnel(self, auth_client, application):
         """Test status funnel endpoint."""
-        url = reverse("status_funnel")
-        response = auth_client.get(url)
+        response = auth_client.get(STATUS_FUNNEL_URL)
         assert response.status_code == status.HTTP_200_OK
 
     def test_weekly_activity(self, auth_client, application):
         """Test weekly activity endpoint."""
-        url = reverse("weekly_activity")
-        response = auth_client.get(url)
+        response = auth_client.get(WEEKLY_ACTIVITY_URL)
         assert response.status_code == status.HTTP_200_OK
 
 
@@ -56,21 +95,18 @@ class TestHealthChecks:
 
     def test_health_check(self, api_client):
         """Test health check endpoint (no auth required)."""
-        url = reverse("health_check")
-        response = api_client.get(url)
+        response = api_client.get(HEALTH_CHECK_URL)
         assert response.status_code == status.HTTP_200_OK
         assert "status" in response.data
         assert "database" in response.data
 
     def test_liveness_check(self, api_client):
         """Test liveness check endpoint."""
-        url = reverse("liveness_check")
-        response = api_client.get(url)
+        response = api_client.get(LIVENESS_CHECK_URL)
         assert response.status_code == status.HTTP_200_OK
         assert response.data["alive"] is True
 
     def test_readiness_check(self, api_client):
         """Test readiness check endpoint."""
-        url = reverse("readiness_check")
-        response = api_client.get(url)
+        response = api_client.get(READINESS_CHECK_URL)
         assert response.status_code == status.HTTP_200_OK
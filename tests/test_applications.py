@@ -5,25 +5,34 @@ Tests for Application CRUD operations.
 from django.urls import reverse
 
 from rest_framework import status
+from rest_framework.test import force_authenticate
 
 import pytest
 
+from apps.applications.models import Application
+from apps.applications.views import ApplicationViewSet
+from apps.companies.models import Company
+
+APPLICATION_LIST_URL = reverse("application-list")
+
+application_list_view = ApplicationViewSet.as_view({"get": "list", "post": "create"})
+application_detail_view = ApplicationViewSet.as_view({"get": "retrieve", "patch": "partial_update"})
+
 
 @pytest.mark.django_db
 class TestApplicationList:
     """Test application list endpoint."""
 
-    def test_list_applications(self, auth_client, application):
+    def test_list_applications(self, auth_client, application, django_assert_max_num_queries):
         """Test listing applications."""
-        url = reverse("application-list")
-        response = auth_client.get(url)
+        with django_assert_max_num_queries(4):
+            response = auth_client.get(APPLICATION_LIST_URL)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) >= 1
+        assert len(response.data["results"]) >= 1
 
     def test_list_applications_unauthenticated(self, api_client):
         """Test listing applications without auth."""
-        url = reverse("application-list")
-        response = api_client.get(url)
+        response = api_client.get(APPLICATION_LIST_URL)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
@@ -33,7 +42,6 @@ class TestApplicationCreate:
 
     def test_create_application(self, auth_client, company):
         """Test creating an application."""
-        url = reverse("application-list")
         data = {
             "company": company.id,
             "job_title": "Backend Developer",
@@ -41,13 +49,12 @@ class TestApplicationCreate:
             "status": "applied",
             "source": "indeed",
         }
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(APPLICATION_LIST_URL, data, format="json")
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data["job_title"] == "Backend Developer"
 
-    def test_create_application_with_salary(self, auth_client, company):
+    def test_create_application_with_salary(self, api_rf, user, company):
         """Test creating application with salary range."""
-        url = reverse("application-list")
         data = {
             "company": company.id,
             "job_title": "Senior Engineer",
@@ -55,7 +62,9 @@ class TestApplicationCreate:
             "salary_min": 150000,
             "salary_max": 200000,
         }
-        response = auth_client.post(url, data, format="json")
+        request = api_rf.post("/", data, format="json")
+        force_authenticate(request, user=user)
+        response = application_list_view(request)
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data["salary_min"] == 150000
 
@@ -72,11 +81,12 @@ class TestApplicationStatus:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["status"] == "interviewing"
 
-    def test_status_choices(self, auth_client, application):
+    def test_status_choices(self, api_rf, user, application):
         """Test that invalid status is rejected."""
-        url = reverse("application-detail", kwargs={"pk": application.id})
         data = {"status": "invalid_status"}
-        response = auth_client.patch(url, data, format="json")
+        request = api_rf.patch("/", data, format="json")
+        force_authenticate(request, user=user)
+        response = application_detail_view(request, pk=application.id)
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
@@ -84,32 +94,37 @@ class TestApplicationStatus:
 class TestApplicationFiltering:
     """Test application filtering."""
 
-    def test_filter_by_status(self, auth_client, user, company):
+    def test_filter_by_status(self, auth_client, user, company, django_assert_max_num_queries):
         """Test filtering by status."""
-        from apps.applications.models import Application
-
-        Application.objects.create(user=user, company=company, job_title="Job 1", status="applied")
-        Application.objects.create(user=user, company=company, job_title="Job 2", status="rejected")
-
-        url = reverse("application-list") + "?status=applied"
-        response = auth_client.get(url)
+        Application.objects.bulk_create(
+            [
+                Application(user=user, company=company, job_title="Job 1", status="applied"),
+                Application(user=user, company=company, job_title="Job 2", status="rejected"),
+            ]
+        )
+
+        url = APPLICATION_LIST_URL + "?status=applied"
+        with django_assert_max_num_queries(4):
+            response = auth_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", response.data)
+        results = response.data["results"]
         assert all(a["status"] == "applied" for a in results)
 
-    def test_filter_by_company(self, auth_client, user, company):
+    def test_filter_by_company(self, api_rf, user, company):
         """Test filtering by company."""
-        from apps.applications.models import Application
-        from apps.companies.models import Company
-
         other_company = Company.objects.create(user=user, name="Other Co")
-        Application.objects.create(user=user, company=company, job_title="Job at Test", status="applied")
-        Application.objects.create(user=user, company=other_company, job_title="Job at Other", status="applied")
-
-        url = reverse("application-list") + f"?company={company.id}"
-        response = auth_client.get(url)
+        Application.objects.bulk_create(
+            [
+                Application(user=user, company=company, job_title="Job at Test", status="applied"),
+                Application(user=user, company=other_company, job_title="Job at Other", status="applied"),
+            ]
+        )
+
+        request = api_rf.get("/", {"company": company.id})
+        force_authenticate(request, user=user)
+        response = application_list_view(request)
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", response.data)
+        results = response.data["results"]
         assert all(a["company"] == company.id for a in results)
 
 
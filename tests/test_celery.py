@@ -2,14 +2,25 @@
 Tests for Celery async AI tasks.
 """
 
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 from django.urls import reverse
 
 import pytest
 
+from apps.ai import tasks, views
 from apps.ai.models import AITask
 
+COVER_LETTER_GENERATE_URL = reverse("cover-letter-generate")
+JOB_MATCH_ANALYZE_URL = reverse("job-match-analyze")
+INTERVIEW_QUESTIONS_GENERATE_URL = reverse("interview-questions-generate")
+AI_TASKS_LIST_URL = reverse("ai-tasks-list")
+AI_TASKS_PENDING_URL = reverse("ai-tasks-pending")
+
+TASK_STARTED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+TASK_COMPLETED_AT = TASK_STARTED_AT + timedelta(seconds=5)
+
 
 @pytest.fixture
 def mock_celery_task():
@@ -19,6 +30,12 @@ def mock_celery_task():
         yield mock
 
 
+@pytest.fixture(scope="class")
+def async_mode(class_mocker):
+    """Force AI endpoints into async mode for the whole test class."""
+    class_mocker.patch.object(views, "should_use_async", return_value=True)
+
+
 @pytest.fixture
 def ai_task(user):
     """Create a test AI task."""
@@ -33,8 +50,6 @@ def ai_task(user):
 @pytest.fixture
 def completed_ai_task(user):
     """Create a completed AI task."""
-    from django.utils import timezone
-
     return AITask.objects.create(
         user=user,
         task_type="cover_letter",
@@ -48,12 +63,13 @@ def completed_ai_task(user):
             "model": "llama-3.3-70b-versatile",
             "tokens_used": 500,
         },
-        started_at=timezone.now(),
-        completed_at=timezone.now(),
+        started_at=TASK_STARTED_AT,
+        completed_at=TASK_COMPLETED_AT,
     )
 
 
 @pytest.mark.django_db
+@pytest.mark.fast_db
 class TestAITaskModel:
     """Tests for AITask model."""
 
@@ -66,18 +82,14 @@ class TestAITaskModel:
 
     def test_ai_task_duration_property(self, user):
         """Test duration calculation."""
-        from datetime import timedelta
-
-        from django.utils import timezone
-
         task = AITask.objects.create(
             user=user,
             task_type="job_match",
             status="completed",
-            started_at=timezone.now(),
-            completed_at=timezone.now() + timedelta(seconds=5),
+            started_at=TASK_STARTED_AT,
+            completed_at=TASK_COMPLETED_AT,
         )
-        assert task.duration == pytest.approx(5, abs=0.1)
+        assert task.duration == 5
 
     def test_ai_task_str(self, user):
         """Test string representation."""
@@ -87,14 +99,13 @@ class TestAITaskModel:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("async_mode")
 class TestAsyncCoverLetterEndpoint:
     """Tests for async cover letter generation."""
 
-    @patch("apps.ai.views.should_use_async", return_value=True)
-    @patch("apps.ai.tasks.generate_cover_letter_task.delay")
-    def test_async_cover_letter_returns_202(self, mock_delay, mock_async, auth_client, user):
+    def test_async_cover_letter_returns_202(self, mocker, auth_client, user):
         """Test async mode returns 202 Accepted with task_id."""
-        url = reverse("cover-letter-generate")
+        mocker.patch.object(tasks.generate_cover_letter_task, "delay")
         data = {
             "job_description": "x" * 100,
             "resume_text": "Experienced developer with Python skills.",
@@ -103,18 +114,16 @@ class TestAsyncCoverLetterEndpoint:
             "async_mode": True,
         }
 
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(COVER_LETTER_GENERATE_URL, data, format="json")
 
         assert response.status_code == 202
         assert "task_id" in response.data
         assert response.data["status"] == "pending"
         assert "message" in response.data
 
-    @patch("apps.ai.views.should_use_async", return_value=True)
-    @patch("apps.ai.tasks.generate_cover_letter_task.delay")
-    def test_async_creates_task_record(self, mock_delay, mock_async, auth_client, user):
+    def test_async_creates_task_record(self, mocker, auth_client, user):
         """Test async mode creates AITask in database."""
-        url = reverse("cover-letter-generate")
+        mocker.patch.object(tasks.generate_cover_letter_task, "delay")
         data = {
             "job_description": "x" * 100,
             "resume_text": "Experienced developer.",
@@ -123,19 +132,17 @@ class TestAsyncCoverLetterEndpoint:
             "async_mode": True,
         }
 
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(COVER_LETTER_GENERATE_URL, data, format="json")
 
         task_id = response.data["task_id"]
-        task = AITask.objects.get(id=task_id)
-        assert task.user == user
+        task = AITask.objects.only("user", "task_type", "status").get(id=task_id)
+        assert task.user_id == user.id
         assert task.task_type == "cover_letter"
         assert task.status == "pending"
 
-    @patch("apps.ai.views.should_use_async", return_value=True)
-    @patch("apps.ai.tasks.generate_cover_letter_task.delay")
-    def test_celery_task_called_with_correct_args(self, mock_delay, mock_async, auth_client, user):
+    def test_celery_task_called_with_correct_args(self, mocker, auth_client, user):
         """Test Celery task is called with correct arguments."""
-        url = reverse("cover-letter-generate")
+        mock_delay = mocker.patch.object(tasks.generate_cover_letter_task, "delay")
         data = {
             "job_description": "x" * 100,
             "resume_text": "Developer resume.",
@@ -145,7 +152,7 @@ class TestAsyncCoverLetterEndpoint:
             "async_mode": True,
         }
 
-        auth_client.post(url, data, format="json")
+        auth_client.post(COVER_LETTER_GENERATE_URL, data, format="json")
 
         mock_delay.assert_called_once()
         call_kwargs = mock_delay.call_args.kwargs
@@ -156,35 +163,33 @@ class TestAsyncCoverLetterEndpoint:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("async_mode")
 class TestAsyncJobMatchEndpoint:
     """Tests for async job match analysis."""
 
-    @patch("apps.ai.views.should_use_async", return_value=True)
-    @patch("apps.ai.tasks.analyze_job_match_task.delay")
-    def test_async_job_match_returns_202(self, mock_delay, mock_async, auth_client):
+    def test_async_job_match_returns_202(self, mocker, auth_client):
         """Test async job match returns 202."""
-        url = reverse("job-match-analyze")
+        mocker.patch.object(tasks.analyze_job_match_task, "delay")
         data = {
             "job_description": "x" * 100,
             "resume_text": "Python developer with 5 years experience.",
             "async_mode": True,
         }
 
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(JOB_MATCH_ANALYZE_URL, data, format="json")
 
         assert response.status_code == 202
         assert "task_id" in response.data
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("async_mode")
 class TestAsyncInterviewQuestionsEndpoint:
     """Tests for async interview questions."""
 
-    @patch("apps.ai.views.should_use_async", return_value=True)
-    @patch("apps.ai.tasks.generate_interview_questions_task.delay")
-    def test_async_interview_questions_returns_202(self, mock_delay, mock_async, auth_client):
+    def test_async_interview_questions_returns_202(self, mocker, auth_client):
         """Test async interview questions returns 202."""
-        url = reverse("interview-questions-generate")
+        mocker.patch.object(tasks.generate_interview_questions_task, "delay")
         data = {
             "job_description": "x" * 100,
             "company_name": "BigTech",
@@ -192,7 +197,7 @@ class TestAsyncInterviewQuestionsEndpoint:
             "async_mode": True,
         }
 
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(INTERVIEW_QUESTIONS_GENERATE_URL, data, format="json")
 
         assert response.status_code == 202
         assert "task_id" in response.data
@@ -204,11 +209,10 @@ class TestAITaskViewSet:
 
     def test_list_tasks(self, auth_client, ai_task):
         """Test listing user's AI tasks."""
-        url = reverse("ai-tasks-list")
-        response = auth_client.get(url)
+        response = auth_client.get(AI_TASKS_LIST_URL)
 
         assert response.status_code == 200
-        data = response.data.get("results", response.data)
+        data = response.data["results"]
         assert len(data) >= 1
 
     def test_retrieve_task(self, auth_client, ai_task):
@@ -232,8 +236,7 @@ class TestAITaskViewSet:
 
     def test_pending_tasks_endpoint(self, auth_client, ai_task, completed_ai_task):
         """Test listing only pending tasks."""
-        url = reverse("ai-tasks-pending")
-        response = auth_client.get(url)
+        response = auth_client.get(AI_TASKS_PENDING_URL)
 
         assert response.status_code == 200
         # Should only include pending task, not completed
@@ -283,17 +286,12 @@ class TestAITaskViewSet:
 class TestSyncModeStillWorks:
     """Ensure sync mode still works when async is disabled."""
 
-    @patch("apps.ai.views.should_use_async", return_value=False)
-    @patch("services.groq_service.GroqService.generate_cover_letter")
-    def test_sync_cover_letter_returns_200(self, mock_groq, mock_async, auth_client):
+    def test_sync_cover_letter_returns_200(self, mocker, auth_client, groq_response):
         """Test sync mode returns 200 with content."""
-        mock_groq.return_value = {
-            "cover_letter": "Dear Hiring Manager, I am excited...",
-            "model": "llama-3.3-70b-versatile",
-            "usage": {"total_tokens": 500},
-        }
+        mocker.patch.object(views, "should_use_async", return_value=False)
+        mock_groq = mocker.patch("services.groq_service.GroqService.generate_cover_letter")
+        mock_groq.return_value = groq_response("cover_letter", "Dear Hiring Manager, I am excited...", tokens=500)
 
-        url = reverse("cover-letter-generate")
         data = {
             "job_description": "x" * 100,
             "resume_text": "Experienced developer.",
@@ -302,7 +300,7 @@ class TestSyncModeStillWorks:
             "async_mode": False,
         }
 
-        response = auth_client.post(url, data, format="json")
+        response = auth_client.post(COVER_LETTER_GENERATE_URL, data, format="json")
 
         assert response.status_code == 200
         assert "cover_letter" in response.data
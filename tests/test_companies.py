@@ -5,21 +5,33 @@ Tests for Company CRUD operations.
 from django.urls import reverse
 
 from rest_framework import status
+from rest_framework.test import force_authenticate
 
 import pytest
 
+from apps.companies.models import Company
+from apps.companies.views import CompanyViewSet
+
+company_list_view = CompanyViewSet.as_view({"get": "list"})
+company_detail_view = CompanyViewSet.as_view({"get": "retrieve"})
+
 
 @pytest.mark.django_db
 class TestCompanyList:
     """Test company list endpoint."""
 
-    def test_list_companies_authenticated(self, auth_client, company):
+    def test_list_companies_authenticated(self, api_rf, user, django_assert_num_queries):
         """Test listing companies when authenticated."""
-        url = reverse("company-list")
-        response = auth_client.get(url)
+        Company.objects.bulk_create([Company(user=user, name=f"Company {i}") for i in range(5)])
+
+        request = api_rf.get("/")
+        force_authenticate(request, user=user)
+        # pagination count + annotated page, however many companies exist
+        with django_assert_num_queries(2):
+            response = company_list_view(request)
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", response.data)
-        assert len(results) >= 1
+        results = response.data["results"]
+        assert len(results) >= 5
 
     def test_list_companies_unauthenticated(self, api_client):
         """Test listing companies when not authenticated."""
@@ -29,8 +41,6 @@ class TestCompanyList:
 
     def test_list_only_own_companies(self, auth_client, auth_client_user2, company, user2):
         """Test that users only see their own companies."""
-        from apps.companies.models import Company
-
         # Create company for user2
         Company.objects.create(user=user2, name="User2 Company", industry="Finance")
 
@@ -38,7 +48,7 @@ class TestCompanyList:
         url = reverse("company-list")
         response = auth_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", response.data)
+        results = response.data["results"]
         assert all(c["name"] != "User2 Company" for c in results)
 
 
@@ -79,10 +89,11 @@ class TestCompanyCreate:
 class TestCompanyDetail:
     """Test company detail/update/delete endpoints."""
 
-    def test_get_company_detail(self, auth_client, company):
+    def test_get_company_detail(self, api_rf, user, company):
         """Test getting company details."""
-        url = reverse("company-detail", kwargs={"pk": company.id})
-        response = auth_client.get(url)
+        request = api_rf.get("/")
+        force_authenticate(request, user=user)
+        response = company_detail_view(request, pk=company.id)
         assert response.status_code == status.HTTP_200_OK
         assert response.data["name"] == company.name
 
@@ -107,32 +118,42 @@ class TestCompanyDetail:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.fixture(scope="module")
+def filter_companies(committed_rows, session_user):
+    """Insert the companies used by the filtering tests in one statement, once per module."""
+    yield from committed_rows(
+        lambda: Company.objects.bulk_create(
+            [
+                Company(user=session_user, name="Tech Co", industry="Technology"),
+                Company(user=session_user, name="Finance Co", industry="Finance"),
+                Company(user=session_user, name="Acme Corporation", industry="Technology"),
+                Company(user=session_user, name="Beta Inc", industry="Finance"),
+            ]
+        )
+    )
+
+
 @pytest.mark.django_db
+@pytest.mark.usefixtures("filter_companies")
 class TestCompanyFiltering:
     """Test company filtering."""
 
-    def test_filter_by_industry(self, auth_client, user):
+    def test_filter_by_industry(self, api_rf, session_user):
         """Test filtering companies by industry."""
-        from apps.companies.models import Company
-
-        Company.objects.create(user=user, name="Tech Co", industry="Technology")
-        Company.objects.create(user=user, name="Finance Co", industry="Finance")
-
-        url = reverse("company-list") + "?industry=Technology"
-        response = auth_client.get(url)
+        request = api_rf.get("/", {"industry": "Technology"})
+        force_authenticate(request, user=session_user)
+        response = company_list_view(request)
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", response.data)
+        results = response.data["results"]
         assert all(c["industry"] == "Technology" for c in results)
+        assert "Finance Co" not in {c["name"] for c in results}
 
-    def test_search_by_name(self, auth_client, user):
+    def test_search_by_name(self, api_rf, session_user):
         """Test searching companies by name."""
-        from apps.companies.models import Company
-
-        Company.objects.create(user=user, name="Acme Corporation", industry="Technology")
-        Company.objects.create(user=user, name="Beta Inc", industry="Finance")
-
-        url = reverse("company-list") + "?search=Acme"
-        response = auth_client.get(url)
+        request = api_rf.get("/", {"search": "Acme"})
+        force_authenticate(request, user=session_user)
+        response = company_list_view(request)
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", response.data)
+        results = response.data["results"]
         assert any("Acme" in c["name"] for c in results)
+        assert "Beta Inc" not in {c["name"] for c in results}
@@ -2,8 +2,6 @@
 Tests for Email Verification and Password Reset.
 """
 
-from unittest.mock import patch
-
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -18,11 +16,8 @@ User = get_user_model()
 class TestEmailVerification:
     """Test email verification endpoints."""
 
-    @patch("apps.users.views.EmailService.send_verification_email")
-    def test_register_sends_verification_email(self, mock_send, api_client):
+    def test_register_sends_verification_email(self, mock_email, api_client):
         """Test that registration sends verification email."""
-        mock_send.return_value = {"success": True, "id": "test-id"}
-
         url = reverse("register")
         data = {
             "email": "newuser@example.com",
@@ -34,16 +29,15 @@ class TestEmailVerification:
         }
         response = api_client.post(url, data, format="json")
         assert response.status_code == status.HTTP_201_CREATED
-        assert mock_send.called
+        assert mock_email.send_verification_email.called
 
         # Check user is not verified
         user = User.objects.get(email="newuser@example.com")
         assert not user.is_email_verified
         assert user.email_verification_token
 
-    def test_verify_email_success(self, api_client, db):
+    def test_verify_email_success(self, api_client, user):
         """Test successful email verification."""
-        user = User.objects.create_user(username="testuser", email="test@example.com", password="testpass123")
         token = user.generate_verification_token()
 
         url = reverse("verify_email")
@@ -59,36 +53,26 @@ class TestEmailVerification:
         response = api_client.post(url, {"token": "invalid-token"}, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch("apps.users.views.EmailService.send_verification_email")
-    def test_resend_verification(self, mock_send, api_client, db):
+    def test_resend_verification(self, mock_email, api_client, user):
         """Test resending verification email."""
-        mock_send.return_value = {"success": True, "id": "test-id"}
-
-        user = User.objects.create_user(username="testuser", email="test@example.com", password="testpass123")
-
         url = reverse("resend_verification")
         response = api_client.post(url, {"email": user.email}, format="json")
 
         assert response.status_code == status.HTTP_200_OK
-        assert mock_send.called
+        assert mock_email.send_verification_email.called
 
 
 @pytest.mark.django_db
 class TestPasswordReset:
     """Test password reset endpoints."""
 
-    @patch("apps.users.views.EmailService.send_password_reset_email")
-    def test_password_reset_request(self, mock_send, api_client, db):
+    def test_password_reset_request(self, mock_email, api_client, user):
         """Test requesting password reset."""
-        mock_send.return_value = {"success": True, "id": "test-id"}
-
-        user = User.objects.create_user(username="testuser", email="test@example.com", password="testpass123")
-
         url = reverse("password_reset_request")
         response = api_client.post(url, {"email": user.email}, format="json")
 
         assert response.status_code == status.HTTP_200_OK
-        assert mock_send.called
+        assert mock_email.send_password_reset_email.called
 
         user.refresh_from_db()
         assert user.password_reset_token
@@ -101,12 +85,8 @@ class TestPasswordReset:
         # Should still return 200 to not reveal if email exists
         assert response.status_code == status.HTTP_200_OK
 
-    @patch("apps.users.views.EmailService.send_password_changed_email")
-    def test_password_reset_confirm(self, mock_send, api_client, db):
+    def test_password_reset_confirm(self, api_client, user):
         """Test confirming password reset."""
-        mock_send.return_value = {"success": True, "id": "test-id"}
-
-        user = User.objects.create_user(username="testuser", email="test@example.com", password="oldpass123")
         token = user.generate_password_reset_token()
 
         url = reverse("password_reset_confirm")
@@ -126,9 +106,8 @@ class TestPasswordReset:
         response = api_client.post(url, data, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    def test_password_reset_confirm_mismatch(self, api_client, db):
+    def test_password_reset_confirm_mismatch(self, api_client, user):
         """Test reset with mismatched passwords."""
-        user = User.objects.create_user(username="testuser", email="test@example.com", password="oldpass123")
         token = user.generate_password_reset_token()
 
         url = reverse("password_reset_confirm")
@@ -6,6 +6,7 @@ from io import BytesIO
 from zipfile import ZipFile
 
 from django.urls import reverse
+from django.utils import timezone
 
 from rest_framework import status
 
@@ -16,52 +17,60 @@ from apps.companies.models import Company
 from apps.interviews.models import Interview
 
 
-@pytest.fixture
-def export_data(user, auth_client):
-    """Create sample data for exports."""
-    # Create companies
-    company1 = Company.objects.create(
-        user=user, name="Tech Corp", website="https://techcorp.com", industry="Technology"
-    )
-    company2 = Company.objects.create(user=user, name="Data Inc", website="https://datainc.com", industry="Data")
+@pytest.fixture(scope="class")
+def export_data(committed_rows, session_user):
+    """
+    Create sample data for exports once per test class.
 
-    # Create applications
-    app1 = Application.objects.create(
-        user=user, company=company1, job_title="Software Engineer", status="applied", location="Remote"
-    )
-    app2 = Application.objects.create(
-        user=user, company=company2, job_title="Data Scientist", status="interviewing", location="NYC"
-    )
+    Yields the companies; their applications and interviews are removed with
+    them when the class finishes.
+    """
 
-    # Create interviews
-    from django.utils import timezone
+    def create():
+        # Create companies
+        company1 = Company.objects.create(
+            user=session_user, name="Tech Corp", website="https://techcorp.com", industry="Technology"
+        )
+        company2 = Company.objects.create(
+            user=session_user, name="Data Inc", website="https://datainc.com", industry="Data"
+        )
 
-    Interview.objects.create(application=app1, interview_type="phone", status="scheduled", scheduled_at=timezone.now())
+        # Create applications
+        app1 = Application.objects.create(
+            user=session_user, company=company1, job_title="Software Engineer", status="applied", location="Remote"
+        )
+        Application.objects.create(
+            user=session_user, company=company2, job_title="Data Scientist", status="interviewing", location="NYC"
+        )
 
-    return {
-        "companies": [company1, company2],
-        "applications": [app1, app2],
-    }
+        # Create interviews
+        Interview.objects.create(
+            application=app1, interview_type="phone", status="scheduled", scheduled_at=timezone.now()
+        )
+        return [company1, company2]
+
+    yield from committed_rows(create)
 
 
 @pytest.mark.django_db
 class TestExportApplications:
     """Tests for application exports."""
 
-    def test_export_applications_csv(self, auth_client, user, export_data):
+    def test_export_applications_csv(self, auth_client, user, export_data, django_assert_num_queries):
         """Test exporting applications to CSV."""
         url = reverse("export-applications")
-        response = auth_client.get(url)
+        # auth user + applications + prefetched notes + prefetched interviews
+        with django_assert_num_queries(4):
+            response = auth_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
         assert response["Content-Type"] == "text/csv"
         assert "attachment" in response["Content-Disposition"]
         assert "applications" in response["Content-Disposition"]
 
-        content = response.content.decode("utf-8")
-        assert "Software Engineer" in content
-        assert "Data Scientist" in content
-        assert "Tech Corp" in content
+        assert b"Software Engineer" in response.content
+        assert b"Data Scientist" in response.content
+        assert b"Tech Corp" in response.content
 
     def test_export_applications_with_status_filter(self, auth_client, user, export_data):
         """Test exporting applications with status filter."""
@@ -69,11 +78,9 @@ class TestExportApplications:
         response = auth_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        content = response.content.decode("utf-8")
-        assert "Software Engineer" in content
+        assert b"Software Engineer" in response.content
         # Data Scientist is "interviewing", should not be in export
-        lines = content.strip().split("\n")
-        assert len(lines) == 2  # Header + 1 row
+        assert response.content.count(b"\n") == 2  # Header + 1 row
 
     def test_export_applications_unauthenticated(self, api_client):
         """Test export requires authentication."""
@@ -96,9 +103,8 @@ class TestExportCompanies:
         assert response.status_code == status.HTTP_200_OK
         assert response["Content-Type"] == "text/csv"
 
-        content = response.content.decode("utf-8")
-        assert "Tech Corp" in content
-        assert "Data Inc" in content
+        assert b"Tech Corp" in response.content
+        assert b"Data Inc" in response.content
 
 
 @pytest.mark.django_db
@@ -113,8 +119,7 @@ class TestExportInterviews:
         assert response.status_code == status.HTTP_200_OK
         assert response["Content-Type"] == "text/csv"
 
-        content = response.content.decode("utf-8")
-        assert "phone" in content.lower()
+        assert b"phone" in response.content.lower()
 
 
 @pytest.mark.django_db
@@ -128,9 +133,14 @@ class TestExportFullReport:
 
         assert response.status_code == status.HTTP_200_OK
         assert response["Content-Type"] == "application/zip"
+        assert response.streaming
+        assert "attachment" in response["Content-Disposition"]
 
-        # Verify it's a valid ZIP with expected files
-        zip_buffer = BytesIO(response.content)
+        # Verify it's a valid ZIP with expected files, consuming the stream chunk by chunk
+        zip_buffer = BytesIO()
+        for chunk in response.streaming_content:
+            zip_buffer.write(chunk)
+        zip_buffer.seek(0)
         with ZipFile(zip_buffer) as zf:
             names = zf.namelist()
             assert "applications.csv" in names
@@ -138,9 +148,9 @@ class TestExportFullReport:
             assert "interviews.csv" in names
             assert "summary.txt" in names
 
-    def test_export_full_report_empty(self, auth_client, user):
+    def test_export_full_report_empty(self, auth_client_user2):
         """Test exporting full report with no data."""
         url = reverse("export-full-report")
-        response = auth_client.get(url)
+        response = auth_client_user2.get(url)
 
         assert response.status_code == status.HTTP_200_OK
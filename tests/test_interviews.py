@@ -8,20 +8,57 @@ from django.urls import reverse
 from django.utils import timezone
 
 from rest_framework import status
+from rest_framework.test import force_authenticate
 
 import pytest
 
+from apps.applications.models import Application
+from apps.interviews.models import Interview
+from apps.interviews.views import InterviewViewSet
+
+interview_list_view = InterviewViewSet.as_view({"get": "list"})
+interview_upcoming_view = InterviewViewSet.as_view({"get": "upcoming"})
+interview_today_view = InterviewViewSet.as_view({"get": "today"})
+
+
+@pytest.fixture(scope="class")
+def shared_interview(committed_rows, session_user, session_company):
+    """
+    Create one interview for read-only list tests, once per test class.
+
+    Tests that change an interview use the function-scoped ``interview``
+    fixture instead, so their writes roll back with the test.
+    """
+
+    def create():
+        application = Application.objects.create(
+            user=session_user, company=session_company, job_title="Software Engineer", status="interviewing"
+        )
+        interview = Interview.objects.create(
+            application=application,
+            interview_type="phone",
+            scheduled_at=timezone.now() + timedelta(days=1),
+            duration_minutes=60,
+        )
+        return [application, interview]
+
+    yield from committed_rows(create)
+
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("shared_interview")
 class TestInterviewList:
     """Test interview list endpoint."""
 
-    def test_list_interviews(self, auth_client, interview):
+    def test_list_interviews(self, api_rf, user, django_assert_num_queries):
         """Test listing interviews."""
-        url = reverse("interview-list")
-        response = auth_client.get(url)
+        request = api_rf.get("/")
+        force_authenticate(request, user=user)
+        # pagination count + page joined with application and company
+        with django_assert_num_queries(2):
+            response = interview_list_view(request)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) >= 1
+        assert len(response.data["results"]) >= 1
 
     def test_list_interviews_unauthenticated(self, api_client):
         """Test listing interviews without auth."""
@@ -63,30 +100,28 @@ class TestInterviewCreate:
 class TestInterviewSpecialEndpoints:
     """Test interview special endpoints (upcoming, today)."""
 
-    def test_upcoming_interviews(self, auth_client, application):
+    def test_upcoming_interviews(self, api_rf, user, application):
         """Test getting upcoming interviews."""
-        from apps.interviews.models import Interview
-
         # Create future interview
         Interview.objects.create(
             application=application, interview_type="onsite", scheduled_at=timezone.now() + timedelta(days=5)
         )
 
-        url = reverse("interview-upcoming")
-        response = auth_client.get(url)
+        request = api_rf.get("/")
+        force_authenticate(request, user=user)
+        response = interview_upcoming_view(request)
         assert response.status_code == status.HTTP_200_OK
 
-    def test_today_interviews(self, auth_client, application):
+    def test_today_interviews(self, api_rf, user, application):
         """Test getting today's interviews."""
-        from apps.interviews.models import Interview
-
         # Create interview for today
         Interview.objects.create(
             application=application, interview_type="phone", scheduled_at=timezone.now() + timedelta(hours=2)
         )
 
-        url = reverse("interview-today")
-        response = auth_client.get(url)
+        request = api_rf.get("/")
+        force_authenticate(request, user=user)
+        response = interview_today_view(request)
         assert response.status_code == status.HTTP_200_OK
 
 
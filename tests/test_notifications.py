@@ -2,26 +2,42 @@
 Tests for Notifications functionality.
 """
 
-from unittest.mock import patch
+from datetime import timedelta
 
 from django.urls import reverse
 from django.utils import timezone
 
 from rest_framework import status
+from rest_framework.test import force_authenticate
 
 import pytest
 
+from apps.applications.models import Application
+from apps.companies.models import Company
+from apps.interviews.models import Interview
 from apps.notifications.models import NotificationLog, NotificationPreference
+from apps.notifications.tasks import send_interview_reminders, send_weekly_summary
+from apps.notifications.views import NotificationLogViewSet, NotificationPreferenceView
+
+notification_preference_view = NotificationPreferenceView.as_view()
+notification_log_list_view = NotificationLogViewSet.as_view({"get": "list"})
+
+
+@pytest.fixture
+def notification_preference(user, db):
+    """Default notification preferences for the test user."""
+    return NotificationPreference.objects.get_or_create(user=user)[0]
 
 
 @pytest.mark.django_db
 class TestNotificationPreferences:
     """Tests for notification preferences."""
 
-    def test_get_preferences_creates_default(self, auth_client, user):
+    def test_get_preferences_creates_default(self, api_rf, user):
         """Test that getting preferences creates default if not exists."""
-        url = reverse("notification-preferences")
-        response = auth_client.get(url)
+        request = api_rf.get("/")
+        force_authenticate(request, user=user)
+        response = notification_preference_view(request)
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["interview_reminders"] is True
@@ -47,11 +63,8 @@ class TestNotificationPreferences:
         assert response.data["interview_reminders"] is False
         assert response.data["quiet_hours_start"] == "22:00:00"
 
-    def test_partial_update_preferences(self, auth_client, user):
+    def test_partial_update_preferences(self, auth_client, notification_preference):
         """Test partial update of preferences."""
-        # Create preference first
-        NotificationPreference.objects.create(user=user)
-
         url = reverse("notification-preferences")
         data = {"weekly_summary": False}
 
@@ -64,39 +77,43 @@ class TestNotificationPreferences:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("notification_preference")
 class TestNotificationLogs:
     """Tests for notification logs."""
 
-    def test_list_notification_logs(self, auth_client, user):
+    def test_list_notification_logs(self, api_rf, user, django_assert_num_queries):
         """Test listing notification logs."""
-        # Create preference first
-        pref = NotificationPreference.objects.create(user=user)
-
         # Create some logs
-        NotificationLog.objects.create(
-            user=user, notification_type="interview_reminder", subject="Interview Tomorrow", status="sent"
-        )
-        NotificationLog.objects.create(
-            user=user, notification_type="weekly_summary", subject="Weekly Summary", status="sent"
+        NotificationLog.objects.bulk_create(
+            [
+                NotificationLog(
+                    user=user, notification_type="interview_reminder", subject="Interview Tomorrow", status="sent"
+                ),
+                NotificationLog(user=user, notification_type="weekly_summary", subject="Weekly Summary", status="sent"),
+            ]
         )
 
-        url = reverse("notification-log-list")
-        response = auth_client.get(url)
+        request = api_rf.get("/")
+        force_authenticate(request, user=user)
+        # pagination count + page
+        with django_assert_num_queries(2):
+            response = notification_log_list_view(request)
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 2
 
-    def test_filter_logs_by_type(self, auth_client, user):
+    def test_filter_logs_by_type(self, api_rf, user):
         """Test filtering logs by notification type."""
-        pref = NotificationPreference.objects.create(user=user)
-
-        NotificationLog.objects.create(
-            user=user, notification_type="interview_reminder", subject="Interview", status="sent"
+        NotificationLog.objects.bulk_create(
+            [
+                NotificationLog(user=user, notification_type="interview_reminder", subject="Interview", status="sent"),
+                NotificationLog(user=user, notification_type="weekly_summary", subject="Summary", status="sent"),
+            ]
         )
-        NotificationLog.objects.create(user=user, notification_type="weekly_summary", subject="Summary", status="sent")
 
-        url = reverse("notification-log-list") + "?notification_type=interview_reminder"
-        response = auth_client.get(url)
+        request = api_rf.get("/", {"notification_type": "interview_reminder"})
+        force_authenticate(request, user=user)
+        response = notification_log_list_view(request)
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 1
@@ -104,7 +121,6 @@ class TestNotificationLogs:
 
     def test_notification_logs_readonly(self, auth_client, user):
         """Test that notification logs are read-only."""
-        pref = NotificationPreference.objects.create(user=user)
         log = NotificationLog.objects.create(user=user, notification_type="test", subject="Test", status="sent")
 
         # Try to delete
@@ -116,21 +132,13 @@ class TestNotificationLogs:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("notification_preference")
 class TestNotificationTasks:
     """Tests for notification Celery tasks."""
 
-    @patch("apps.notifications.tasks._send_interview_reminder_email")
-    def test_send_interview_reminders(self, mock_send_email, user):
+    def test_send_interview_reminders(self, monkeypatch, user):
         """Test sending interview reminders."""
-        from datetime import timedelta
-
-        from apps.applications.models import Application
-        from apps.companies.models import Company
-        from apps.interviews.models import Interview
-        from apps.notifications.tasks import send_interview_reminders
-
-        # Create preference
-        NotificationPreference.objects.create(user=user, interview_reminders=True)
+        monkeypatch.setattr("apps.notifications.tasks._send_interview_reminder_email", lambda *args, **kwargs: True)
 
         # Create interview in next 24 hours
         company = Company.objects.create(user=user, name="Test Co")
@@ -142,20 +150,13 @@ class TestNotificationTasks:
             scheduled_at=timezone.now() + timedelta(hours=12),
         )
 
-        mock_send_email.return_value = True
-
         result = send_interview_reminders()
 
         assert result["reminders_sent"] >= 0
 
-    @patch("apps.notifications.tasks._send_weekly_summary_email")
-    def test_send_weekly_summary(self, mock_send_email, user):
+    def test_send_weekly_summary(self, monkeypatch, user):
         """Test sending weekly summary."""
-        from apps.notifications.tasks import send_weekly_summary
-
-        NotificationPreference.objects.create(user=user, weekly_summary=True)
-
-        mock_send_email.return_value = True
+        monkeypatch.setattr("apps.notifications.tasks._send_weekly_summary_email", lambda *args, **kwargs: True)
 
         result = send_weekly_summary()
 
@@ -2,6 +2,10 @@
 Tests for Two-Factor Authentication.
 """
 
+import base64
+import copy
+import hashlib
+import time
 
 from django.urls import reverse
 
@@ -11,7 +15,33 @@ import pyotp
 import pytest
 
 from apps.twofa.models import BackupCode, TwoFactorDevice
-from apps.twofa.services import TwoFactorService
+from apps.twofa.services import TwoFactorService, _render_qr_png
+
+
+@pytest.fixture(scope="class")
+def shared_2fa_device(committed_rows, session_user):
+    """
+    Create an enabled 2FA device with backup codes once per test class.
+
+    Codes a test consumes or regenerates and a device it disables are restored
+    when the test rolls back. Created by ``user_id`` so the session user's
+    reverse one-to-one cache is not primed with a device that outlives the class.
+    """
+
+    def create():
+        device = TwoFactorDevice.objects.create(
+            user_id=session_user.id, secret=pyotp.random_base32(), is_enabled=True, is_verified=True
+        )
+        BackupCode.generate_codes(device)
+        return device
+
+    yield from committed_rows(create)
+
+
+@pytest.fixture
+def enabled_2fa(db, shared_2fa_device):
+    """Return this test's copy of the class's enabled 2FA device."""
+    return copy.deepcopy(shared_2fa_device)
 
 
 @pytest.mark.django_db
@@ -85,15 +115,6 @@ class TestTwoFactorSetup:
 class TestTwoFactorVerification:
     """Tests for 2FA verification."""
 
-    @pytest.fixture
-    def enabled_2fa(self, user):
-        """Create an enabled 2FA device."""
-        device = TwoFactorDevice.objects.create(
-            user=user, secret=pyotp.random_base32(), is_enabled=True, is_verified=True
-        )
-        BackupCode.generate_codes(device)
-        return device
-
     def test_verify_totp_valid(self, auth_client, user, enabled_2fa):
         """Test verifying valid TOTP code."""
         totp = pyotp.TOTP(enabled_2fa.secret)
@@ -138,15 +159,6 @@ class TestTwoFactorVerification:
 class TestTwoFactorDisable:
     """Tests for disabling 2FA."""
 
-    @pytest.fixture
-    def enabled_2fa(self, user):
-        """Create an enabled 2FA device."""
-        device = TwoFactorDevice.objects.create(
-            user=user, secret=pyotp.random_base32(), is_enabled=True, is_verified=True
-        )
-        BackupCode.generate_codes(device)
-        return device
-
     def test_disable_2fa_valid(self, auth_client, user, enabled_2fa):
         """Test disabling 2FA with valid credentials."""
         totp = pyotp.TOTP(enabled_2fa.secret)
@@ -183,15 +195,6 @@ class TestTwoFactorDisable:
 class TestBackupCodes:
     """Tests for backup codes."""
 
-    @pytest.fixture
-    def enabled_2fa(self, user):
-        """Create an enabled 2FA device."""
-        device = TwoFactorDevice.objects.create(
-            user=user, secret=pyotp.random_base32(), is_enabled=True, is_verified=True
-        )
-        BackupCode.generate_codes(device)
-        return device
-
     def test_regenerate_backup_codes(self, auth_client, user, enabled_2fa):
         """Test regenerating backup codes."""
         totp = pyotp.TOTP(enabled_2fa.secret)
@@ -211,6 +214,15 @@ class TestBackupCodes:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_generate_codes_single_insert(self, enabled_2fa, django_assert_num_queries):
+        """Test codes are generated with one DELETE and one bulk INSERT."""
+        with django_assert_num_queries(2):
+            codes = BackupCode.generate_codes(enabled_2fa)
+
+        assert len(set(codes)) == 10
+        assert all(len(code) == 9 and code[4] == "-" for code in codes)
+        assert BackupCode.objects.filter(device=enabled_2fa, is_used=False).count() == 10
+
     def test_backup_code_can_only_be_used_once(self, user, enabled_2fa):
         """Test that backup codes can only be used once."""
         codes = BackupCode.generate_codes(enabled_2fa)
@@ -223,6 +235,29 @@ class TestBackupCodes:
         result2 = BackupCode.verify_code(enabled_2fa, codes[0])
         assert result2 is False
 
+    def test_backup_codes_stored_with_pepper(self, enabled_2fa):
+        """Test codes are stored as keyed hashes while legacy unkeyed hashes still verify."""
+        code = BackupCode.generate_codes(enabled_2fa, count=1)[0]
+        stored = BackupCode.objects.get(device=enabled_2fa, is_used=False)
+        assert stored.code_hash != hashlib.sha256(code.encode()).hexdigest()
+
+        BackupCode.objects.create(device=enabled_2fa, code_hash=hashlib.sha256(b"ABCD-1234").hexdigest())
+        assert BackupCode.verify_code(enabled_2fa, "abcd1234") is True
+
+    def test_backup_codes_survive_secret_key_rotation(self, settings, enabled_2fa):
+        """Test codes peppered with SECRET_KEY still verify once that key moves to SECRET_KEY_FALLBACKS."""
+        settings.TWOFA_CODE_PEPPER = ""
+        settings.SECRET_KEY = "old-secret-key"
+        settings.SECRET_KEY_FALLBACKS = []
+        codes = BackupCode.generate_codes(enabled_2fa, count=2)
+
+        settings.SECRET_KEY = "new-secret-key"
+        assert BackupCode.verify_code(enabled_2fa, codes[0]) is False
+
+        settings.SECRET_KEY_FALLBACKS = ["old-secret-key"]
+        assert BackupCode.verify_code(enabled_2fa, codes[0]) is True
+        assert BackupCode.verify_code(enabled_2fa, codes[1]) is True
+
 
 @pytest.mark.django_db
 class TestTwoFactorService:
@@ -243,12 +278,20 @@ class TestTwoFactorService:
 
         # Should be base64 encoded
         assert len(qr_code) > 0
-        import base64
 
         # Should be valid base64
         decoded = base64.b64decode(qr_code)
         assert decoded.startswith(b"\x89PNG")  # PNG signature
 
+    def test_generate_qr_code_reuses_rendered_image(self, user):
+        """Test a repeat setup for the same secret reuses the cached PNG."""
+        secret = TwoFactorService.generate_secret()
+        first = TwoFactorService.generate_qr_code(user.email, secret)
+        hits = _render_qr_png.cache_info().hits
+
+        assert TwoFactorService.generate_qr_code(user.email, secret) == first
+        assert _render_qr_png.cache_info().hits == hits + 1
+
     def test_is_2fa_enabled(self, user):
         """Test checking if 2FA is enabled."""
         assert TwoFactorService.is_2fa_enabled(user) is False
@@ -272,3 +315,34 @@ class TestTwoFactorService:
         status_data = TwoFactorService.get_status(user)
         assert status_data["enabled"] is True
         assert status_data["backup_codes_remaining"] == 10
+
+    def test_get_device_cached_on_user(self, user, django_assert_num_queries):
+        """Test repeated 2FA checks on one user instance load the device once."""
+        TwoFactorDevice.objects.create(user=user, secret=pyotp.random_base32(), is_enabled=True, is_verified=True)
+        request_user = type(user).objects.get(pk=user.pk)
+
+        with django_assert_num_queries(1):
+            assert TwoFactorService.is_2fa_enabled(request_user) is True
+            assert TwoFactorService.get_device(request_user).is_verified is True
+
+    def test_verify_totp_valid_window(self, monkeypatch, user):
+        """Test codes from adjacent time steps verify and codes further out do not."""
+        secret = pyotp.random_base32()
+        TwoFactorDevice.objects.create(user=user, secret=secret, is_enabled=True, is_verified=True)
+        totp = pyotp.TOTP(secret)
+        now = time.time()
+        monkeypatch.setattr("apps.twofa.services.time.time", lambda: now)
+
+        assert TwoFactorService.verify_totp(user, totp.at(now, -1)) is True
+        assert TwoFactorService.verify_totp(user, totp.at(now, 1)) is True
+        assert TwoFactorService.verify_totp(user, totp.at(now, -3)) is False
+
+    def test_verify_totp_normalizes_unicode_digits(self, monkeypatch, user):
+        """Test full-width digits are NFKC-normalized before comparison, as pyotp did."""
+        secret = pyotp.random_base32()
+        TwoFactorDevice.objects.create(user=user, secret=secret, is_enabled=True, is_verified=True)
+        now = time.time()
+        monkeypatch.setattr("apps.twofa.services.time.time", lambda: now)
+        full_width = pyotp.TOTP(secret).at(now).translate({ord(d): 0xFF10 + int(d) for d in "0123456789"})
+
+        assert TwoFactorService.verify_totp(user, full_width) is True
@@ -2,6 +2,13 @@
 Tests for Webhook functionality.
 """
 
+import copy
+import hashlib
+import hmac
+import importlib
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 from django.urls import reverse
@@ -11,19 +18,63 @@ from rest_framework import status
 import pytest
 
 from apps.webhooks.models import WebhookDelivery, WebhookEndpoint
-from apps.webhooks.services import WebhookService
+from apps.webhooks.services import WebhookService, _http_client, close_http_client
+
+
+@pytest.fixture(scope="module")
+def shared_webhook_endpoint(committed_rows, session_user):
+    """
+    Create the test webhook endpoint once for this module.
+
+    Updates, secret rotation, deletion and deliveries made by a test all roll
+    back with that test.
+    """
+    yield from committed_rows(
+        lambda: WebhookEndpoint.objects.create(
+            user=session_user,
+            name="Test Webhook",
+            url="https://webhook.site/test",
+            events=["application.created", "application.status_changed"],
+            is_active=True,
+        )
+    )
 
 
 @pytest.fixture
-def webhook_endpoint(user):
-    """Create a test webhook endpoint."""
-    return WebhookEndpoint.objects.create(
-        user=user,
-        name="Test Webhook",
-        url="https://webhook.site/test",
-        events=["application.created", "application.status_changed"],
-        is_active=True,
-    )
+def webhook_endpoint(db, shared_webhook_endpoint):
+    """Return this test's copy of the shared webhook endpoint."""
+    return copy.deepcopy(shared_webhook_endpoint)
+
+
+@pytest.fixture
+def receiver():
+    """
+    Run a local HTTP server that records the Cookie header of each POST by path.
+
+    ``/set-cookie`` answers with a Set-Cookie header, as a tenant's endpoint might.
+    """
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.path, self.headers.get("Cookie")))
+            self.send_response(200)
+            if self.path == "/set-cookie":
+                self.send_header("Set-Cookie", "session=tenant-a; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield SimpleNamespace(url=f"http://127.0.0.1:{server.server_port}", received=received)
+    server.shutdown()
+    server.server_close()
+    close_http_client()
 
 
 @pytest.mark.django_db
@@ -95,10 +146,12 @@ class TestWebhookEndpointCRUD:
         assert "secret" in response.data
         assert response.data["secret"] != old_secret
 
-    def test_list_available_events(self, auth_client, user):
+    def test_list_available_events(self, auth_client, user, django_assert_num_queries):
         """Test listing available webhook events."""
         url = reverse("webhook-endpoint-events")
-        response = auth_client.get(url)
+        # auth user only; the catalogue is built once at startup
+        with django_assert_num_queries(1):
+            response = auth_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
         assert "events" in response.data
@@ -125,7 +178,7 @@ class TestWebhookDeliveries:
         assert len(response.data["results"]) == 1
         assert response.data["results"][0]["event"] == "application.created"
 
-    def test_filter_deliveries_by_status(self, auth_client, user, webhook_endpoint):
+    def test_filter_deliveries_by_status(self, auth_client, user, webhook_endpoint, django_assert_num_queries):
         """Test filtering deliveries by status."""
         WebhookDelivery.objects.create(
             endpoint=webhook_endpoint, event="application.created", payload={"test": "data"}, status="success"
@@ -135,7 +188,9 @@ class TestWebhookDeliveries:
         )
 
         url = reverse("webhook-delivery-list") + "?status=success"
-        response = auth_client.get(url)
+        # auth user + pagination count + page joined to its endpoint
+        with django_assert_num_queries(3):
+            response = auth_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 1
@@ -170,9 +225,21 @@ class TestWebhookService:
         signature = WebhookService.generate_signature(payload, secret)
 
         assert len(signature) == 64  # SHA256 hex
+        assert signature == hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
         # Same input should give same output
         assert signature == WebhookService.generate_signature(payload, secret)
 
+    def test_verify_signature(self):
+        """Test signatures round-trip and tampered or malformed ones are rejected."""
+        payload = b'{"test":"data"}'
+        signature = WebhookService.generate_signature(payload, "test_secret")
+
+        assert WebhookService.verify_signature(payload, signature, "test_secret") is True
+        assert WebhookService.verify_signature(payload, f"sha256={signature}", "test_secret") is True
+        assert WebhookService.verify_signature(payload, signature, "other_secret") is False
+        assert WebhookService.verify_signature(b'{"test":"tampered"}', signature, "test_secret") is False
+        assert WebhookService.verify_signature(payload, "not-hex", "test_secret") is False
+
     @patch("apps.webhooks.tasks.deliver_webhook.delay")
     def test_dispatch_event(self, mock_deliver, user, webhook_endpoint):
         """Test dispatching an event to subscribed webhooks."""
@@ -193,7 +260,7 @@ class TestWebhookService:
         assert WebhookDelivery.objects.count() == 0
         mock_deliver.assert_not_called()
 
-    @patch("httpx.Client")
+    @patch("apps.webhooks.services._http_client")
     def test_deliver_success(self, mock_client, webhook_endpoint):
         """Test successful webhook delivery."""
         delivery = WebhookDelivery.objects.create(
@@ -203,7 +270,7 @@ class TestWebhookService:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "OK"
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = WebhookService.deliver(delivery)
 
@@ -212,7 +279,22 @@ class TestWebhookService:
         assert delivery.status == "success"
         assert delivery.response_status_code == 200
 
-    @patch("httpx.Client")
+    @patch("apps.webhooks.services._http_client")
+    def test_deliver_signs_sent_body(self, mock_client, webhook_endpoint):
+        """Test the signature covers exactly the bytes posted to the endpoint."""
+        delivery = WebhookDelivery.objects.create(
+            endpoint=webhook_endpoint, event="application.created", payload={"test": "data"}
+        )
+        mock_client.return_value.post.return_value = MagicMock(status_code=200, text="OK")
+
+        WebhookService.deliver(delivery)
+
+        kwargs = mock_client.return_value.post.call_args.kwargs
+        assert kwargs["content"] == b'{"test":"data"}'
+        expected = WebhookService.generate_signature(kwargs["content"], webhook_endpoint.secret)
+        assert kwargs["headers"]["X-Webhook-Signature"] == f"sha256={expected}"
+
+    @patch("apps.webhooks.services._http_client")
     def test_deliver_failure(self, mock_client, webhook_endpoint):
         """Test failed webhook delivery."""
         delivery = WebhookDelivery.objects.create(
@@ -222,7 +304,7 @@ class TestWebhookService:
         mock_response = MagicMock()
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         with patch("apps.webhooks.tasks.deliver_webhook.apply_async"):
             result = WebhookService.deliver(delivery)
@@ -231,15 +313,92 @@ class TestWebhookService:
         delivery.refresh_from_db()
         assert delivery.status == "retrying"
 
-    @patch("httpx.Client")
+    @patch("apps.webhooks.services._http_client")
     def test_send_test_webhook(self, mock_client, webhook_endpoint):
         """Test sending a test webhook."""
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "OK"
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = WebhookService.send_test_webhook(webhook_endpoint)
 
         assert result["success"] is True
         assert result["status_code"] == 200
+
+    def test_http_client_reused_until_closed(self):
+        """Test deliveries share one pooled HTTP client per process until it is closed."""
+        client = _http_client()
+        assert _http_client() is client
+
+        close_http_client()
+        assert client.is_closed
+        assert _http_client.cache_info().currsize == 0
+
+    def test_http_client_does_not_share_cookies_between_endpoints(self, receiver, user, user2):
+        """Test a cookie set by one user's endpoint is not replayed to another's on the same host."""
+        endpoint_a = WebhookEndpoint.objects.create(
+            user=user, name="A", url=f"{receiver.url}/set-cookie", events=["application.created"]
+        )
+        endpoint_b = WebhookEndpoint.objects.create(
+            user=user2, name="B", url=f"{receiver.url}/other", events=["application.created"]
+        )
+
+        for endpoint in (endpoint_a, endpoint_b):
+            delivery = WebhookDelivery.objects.create(endpoint=endpoint, event="application.created", payload={})
+            assert WebhookService.deliver(delivery) is True
+
+        assert receiver.received == [("/set-cookie", None), ("/other", None)]
+
+    def test_event_bits_are_pinned(self):
+        """Test every event keeps the bit stored masks (and migration 0003's backfill) were written with."""
+        assert WebhookEndpoint.EVENT_BITS == {
+            "application.created": 1,
+            "application.updated": 2,
+            "application.deleted": 4,
+            "application.status_changed": 8,
+            "interview.created": 16,
+            "interview.updated": 32,
+            "interview.completed": 64,
+            "interview.cancelled": 128,
+            "company.created": 256,
+        }
+        migration = importlib.import_module("apps.webhooks.migrations.0003_webhookendpoint_events_mask")
+        assert {name: 1 << index for index, name in enumerate(migration.EVENTS)} == WebhookEndpoint.EVENT_BITS
+        assert {name for name, _ in WebhookEndpoint.EVENT_CHOICES} == set(WebhookEndpoint.EVENT_BITS)
+
+    def test_events_mask_follows_events(self, webhook_endpoint):
+        """Test the subscription bitmask is kept in sync with the events list on save."""
+        bits = WebhookEndpoint.EVENT_BITS
+        assert webhook_endpoint.events_mask == bits["application.created"] | bits["application.status_changed"]
+
+        webhook_endpoint.events = ["company.created"]
+        webhook_endpoint.save(update_fields=["events"])
+        webhook_endpoint.refresh_from_db()
+        assert webhook_endpoint.events_mask == bits["company.created"]
+
+    @patch("apps.webhooks.tasks.deliver_webhook.delay")
+    def test_dispatch_event_fans_out_in_one_insert(
+        self, mock_deliver, user, webhook_endpoint, django_assert_num_queries
+    ):
+        """Test fan-out to several endpoints creates every delivery in a single INSERT."""
+        WebhookEndpoint.objects.bulk_create(
+            [
+                WebhookEndpoint(
+                    user=user,
+                    name=f"Extra {i}",
+                    url=f"https://example.com/{i}",
+                    secret="s",
+                    events=["application.created"],
+                    events_mask=WebhookEndpoint.events_to_mask(["application.created"]),
+                )
+                for i in range(3)
+            ]
+        )
+
+        # endpoints SELECT + deliveries INSERT
+        with django_assert_num_queries(2):
+            WebhookService.dispatch_event("application.created", {"id": 1}, user.id)
+
+        assert WebhookDelivery.objects.filter(event="application.created").count() == 4
+        assert mock_deliver.call_count == 4